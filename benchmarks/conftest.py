@@ -0,0 +1,40 @@
+"""Fixtures for the benchmarks.
+
+Workbooks are generated once per session at each size in `LIFTERS`.
+"""
+
+import pytest
+
+from tests.workbooks import make_excelmacro_workbook, make_owlcms_workbook
+
+LIFTERS = [10, 100, 1_000, 10_000]
+# excel macro sessions hold about this many lifters, one sheet each
+SESSION_SIZE = 25
+
+
+@pytest.fixture(scope="session", params=LIFTERS, ids="{}-lifters".format)
+def lifters(request):
+    """Provide the number of lifters to benchmark with."""
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def workbooks(tmp_path_factory):
+    """Provide a generated workbook for each file type and size."""
+    directory = tmp_path_factory.mktemp("workbooks")
+    paths = {}
+
+    def workbook(file_type: str, lifters: int):
+        key = (file_type, lifters)
+        if key not in paths:
+            path = directory / f"{file_type}-{lifters}.xlsx"
+            if file_type == "owlcms":
+                make_owlcms_workbook(path, lifters)
+            else:
+                make_excelmacro_workbook(
+                    path, lifters, sessions=max(1, lifters // SESSION_SIZE)
+                )
+            paths[key] = path
+        return paths[key]
+
+    return workbook
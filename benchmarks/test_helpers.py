@@ -0,0 +1,36 @@
+"""Benchmark the array helpers on a results file's worth of cells."""
+
+import pytest
+
+from timeit_helpers import make_cells
+from utils import helpers
+
+# lift cells per lifter, other columns have one cell per lifter
+ATTEMPTS = 6
+
+HELPERS = {
+    "parse_lift_numbers": ("lifts", helpers.parse_lift_numbers),
+    "determine_lifts": ("lifts", helpers.determine_lifts),
+    "convert_dates": ("dates", helpers.convert_dates),
+    "parse_weight_categories": (
+        "categories",
+        helpers.parse_weight_categories,
+    ),
+    "parse_weight_categories_excelmacro": (
+        "excelmacro_categories",
+        helpers.parse_weight_categories_excelmacro,
+    ),
+    "parse_names": ("names", helpers.parse_names),
+}
+
+
+@pytest.mark.parametrize("helper", HELPERS)
+def test_helper(benchmark, helper, lifters):
+    """Benchmark an array helper."""
+    column, func = HELPERS[helper]
+    cells = lifters * ATTEMPTS if column == "lifts" else lifters
+    values = make_cells(cells)[column]
+
+    result = benchmark(func, values)
+
+    assert len(result["first_name"] if helper == "parse_names" else result)
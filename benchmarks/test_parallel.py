@@ -0,0 +1,50 @@
+"""Benchmark parsing sheets in worker processes against sheet count.
+
+Compare the groups to read the speedup for each number of sheets:
+
+>>> pytest benchmarks/test_parallel.py --benchmark-only \\
+...     --benchmark-group-by=param:sheets
+"""
+
+import pytest
+
+from file import CompetitionFile
+from tests.workbooks import make_excelmacro_workbook
+
+SHEETS = [1, 4, 16, 64]
+WORKERS = [1, 2, 4]
+# lifters in each session sheet
+SESSION_SIZE = 25
+
+
+@pytest.fixture(scope="module")
+def session_workbooks(tmp_path_factory):
+    """Provide an excel macro workbook for each number of sheets."""
+    directory = tmp_path_factory.mktemp("sessions")
+    paths = {}
+    for sheets in SHEETS:
+        paths[sheets] = directory / f"excelmacro-{sheets}.xlsx"
+        make_excelmacro_workbook(
+            paths[sheets], sheets * SESSION_SIZE, sessions=sheets
+        )
+    return paths
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("sheets", SHEETS)
+def test_extract_workers(benchmark, session_workbooks, sheets, workers):
+    """Benchmark extracting every sheet with `workers` processes."""
+    path = session_workbooks[sheets]
+
+    def setup():
+        comp = CompetitionFile(path, "excelmacro", workers=workers)
+        return (comp,), {}
+
+    df = benchmark.pedantic(
+        lambda comp: comp.extract(*comp.sheetnames, dtype=object),
+        setup=setup,
+        rounds=5,
+        warmup_rounds=1,
+    )
+
+    assert len(df) >= sheets * SESSION_SIZE
@@ -0,0 +1,88 @@
+"""Benchmark parsing competition files.
+
+Every round opens the file afresh, so nothing is reused between rounds.
+
+>>> make bench-baseline  # store a baseline
+>>> make bench  # fail if slower than the baseline
+"""
+
+import pytest
+
+from file import CompetitionFile
+
+FILE_TYPES = ["owlcms", "excelmacro"]
+RESULT_SHEETS = {"owlcms": ("Men's Results", "Women's Results")}
+# the 10k lifter files take seconds to parse
+ROUNDS = {10: 20, 100: 10, 1_000: 5, 10_000: 3}
+
+
+def run(benchmark, func, path, file_type: str, lifters: int):
+    """Time `func` on a newly opened file, returning its last result."""
+
+    def setup():
+        return (CompetitionFile(path, file_type),), {}
+
+    return benchmark.pedantic(
+        func, setup=setup, rounds=ROUNDS[lifters], warmup_rounds=1
+    )
+
+
+@pytest.mark.parametrize("file_type", FILE_TYPES)
+def test_sheetnames(benchmark, workbooks, file_type, lifters):
+    """Benchmark opening a file and listing its sheets."""
+    path = workbooks(file_type, lifters)
+
+    sheetnames = run(
+        benchmark,
+        lambda comp: comp.sheetnames,
+        path,
+        file_type,
+        lifters,
+    )
+
+    assert sheetnames
+
+
+@pytest.mark.parametrize("file_type", FILE_TYPES)
+def test_extract(benchmark, workbooks, file_type, lifters):
+    """Benchmark reading the results sheets into one dataframe."""
+    path = workbooks(file_type, lifters)
+
+    def extract(comp):
+        return comp.extract(*RESULT_SHEETS.get(file_type, comp.sheetnames))
+
+    df = run(benchmark, extract, path, file_type, lifters)
+
+    assert len(df) >= lifters
+
+
+@pytest.mark.parametrize("file_type", FILE_TYPES)
+def test_competition(benchmark, workbooks, file_type, lifters):
+    """Benchmark parsing the competition details."""
+    path = workbooks(file_type, lifters)
+
+    competition = run(
+        benchmark,
+        lambda comp: comp.competition,
+        path,
+        file_type,
+        lifters,
+    )
+
+    assert competition["date_start"]
+
+
+@pytest.mark.parametrize("file_type", FILE_TYPES)
+def test_results(benchmark, workbooks, file_type, lifters):
+    """Benchmark parsing the athletes and lifts."""
+    path = workbooks(file_type, lifters)
+
+    results = run(
+        benchmark,
+        lambda comp: comp._results(),
+        path,
+        file_type,
+        lifters,
+    )
+
+    assert len(results["lifts"]) == lifters
@@ -0,0 +1,107 @@
+"""Compare the scalar and array helpers on 100k cells.
+
+>>> python benchmarks/timeit_helpers.py
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "src" / "parsing-competition-results"),
+)
+
+from utils import helpers  # noqa: E402
+
+CELLS = 100_000
+REPEAT = 3
+
+
+def make_cells(cells: int = CELLS, seed: int = 0) -> dict[str, pd.Series]:
+    """Provide columns of cells like those in results files."""
+    rng = random.Random(seed)
+    names = [
+        f"{first} {last}"
+        for first in ("Ann", "John Paul", "Karu", "Mere")
+        for last in ("Lee", "Te Moana", "Smith", "Ng", "Brown")
+    ]
+    return {
+        "lifts": pd.Series(
+            [
+                rng.choice([rng.randint(-180, 180), 0, np.nan])
+                for _ in range(cells)
+            ],
+            dtype=float,
+        ),
+        "dates": pd.Series(
+            [f"{rng.randint(1, 28)}/06/2022" for _ in range(cells)]
+        ),
+        "categories": pd.Series(
+            [
+                rng.choice(["M 61", "M 73", "M > 109", "F 55", "F > 87"])
+                for _ in range(cells)
+            ]
+        ),
+        "excelmacro_categories": pd.Series(
+            [
+                rng.choice(list(helpers.WEIGHT_CATEGORY_EXCELMACRO))
+                for _ in range(cells)
+            ]
+        ),
+        "names": pd.Series([rng.choice(names) for _ in range(cells)]),
+    }
+
+
+def main() -> None:
+    """Print the best of `REPEAT` runs for each helper."""
+    cells = make_cells()
+    cases = {
+        "parse_lift_number": (
+            lambda: [helpers.parse_lift_number(x) for x in cells["lifts"]],
+            lambda: helpers.parse_lift_numbers(cells["lifts"]),
+        ),
+        "determine_lift": (
+            lambda: [helpers.determine_lift(x) for x in cells["lifts"]],
+            lambda: helpers.determine_lifts(cells["lifts"]),
+        ),
+        "convert_date": (
+            lambda: [helpers.convert_date(x) for x in cells["dates"]],
+            lambda: helpers.convert_dates(cells["dates"]),
+        ),
+        "parse_weight_category": (
+            lambda: [
+                helpers.parse_weight_category(x) for x in cells["categories"]
+            ],
+            lambda: helpers.parse_weight_categories(cells["categories"]),
+        ),
+        "parse_weight_category_excelmacro": (
+            lambda: [
+                helpers.parse_weight_category_excelmacro(x)
+                for x in cells["excelmacro_categories"]
+            ],
+            lambda: helpers.parse_weight_categories_excelmacro(
+                cells["excelmacro_categories"]
+            ),
+        ),
+        "name_parser": (
+            lambda: [helpers.name_parser(x) for x in cells["names"]],
+            lambda: helpers.parse_names(cells["names"]),
+        ),
+    }
+    print(f"{'helper':<34}{'scalar (ms)':>12}{'array (ms)':>12}{'speedup':>9}")
+    for name, (scalar, array) in cases.items():
+        scalar_time = min(timeit.repeat(scalar, number=1, repeat=REPEAT))
+        array_time = min(timeit.repeat(array, number=1, repeat=REPEAT))
+        print(
+            f"{name:<34}{scalar_time * 1000:>12.1f}{array_time * 1000:>12.1f}"
+            f"{scalar_time / array_time:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Run the command line interface."""
+
+from cli import app
+
+app()
@@ -0,0 +1,204 @@
+"""Local index of the athletes in the lifter-api."""
+
+import json
+import os
+import threading
+import unicodedata
+from pathlib import Path
+
+from lifter_api import LifterAPI
+
+from utils.pagination import sync
+from utils.types import AthleteType
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for matching.
+
+    Accents, case and repeated whitespace are ignored, so "Tē  Moana" and
+    "te moana" match.
+
+    Args:
+        name (str): First or last name.
+
+    Returns:
+        str: Normalized name.
+    """
+    name = unicodedata.normalize("NFKD", str(name))
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(name.casefold().split())
+
+
+def athlete_key(athlete: AthleteType) -> tuple[str, str, int]:
+    """Identify an athlete by normalized name and year born.
+
+    Args:
+        athlete (AthleteType): Athlete.
+
+    Returns:
+        tuple[str, str, int]: Index key.
+    """
+    return (
+        normalize_name(athlete["first_name"]),
+        normalize_name(athlete["last_name"]),
+        int(athlete["yearborn"]),
+    )
+
+
+class AthleteIndex:
+    """Athletes in the lifter-api, by normalized name and year born.
+
+    The athlete list is paged through once, fetching pages concurrently,
+    and kept in memory and in `index_path`. Later refreshes only fetch the
+    pages from the last one seen, which relies on the API listing athletes
+    in the order they were created, and start again from the first page if
+    the athletes known no longer match the count. Athletes created through
+    `create_athlete` are added straight away, so lookups never go to the
+    network.
+
+    >>> athletes = AthleteIndex(api, Path(".cache/athletes.json"))
+    >>> athletes.refresh()
+    >>> athletes.find({"first_name": "Ann", "last_name": "Lee", ...})
+    ['a1b2c3']
+    """
+
+    def __init__(self, api: LifterAPI, index_path: Path | None = None):
+        self.api = api
+        self.index_path = None if index_path is None else Path(index_path)
+        self.athletes: dict[str, AthleteType] = {}
+        # athletes consumed from the API listing, and its page size
+        self.synced = 0
+        self.page_size = None
+        self._keys: dict[tuple[str, str, int], list[str]] = {}
+        self._lock = threading.Lock()
+        if self.index_path is not None and self.index_path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.athletes)
+
+    def add(self, athlete: dict) -> None:
+        """Add or update an athlete from the API.
+
+        Args:
+            athlete (dict): Athlete with its "reference_id".
+        """
+        reference_id = athlete["reference_id"]
+        athlete = {
+            "first_name": athlete["first_name"],
+            "last_name": athlete["last_name"],
+            "yearborn": athlete["yearborn"],
+        }
+        with self._lock:
+            previous = self.athletes.get(reference_id)
+            if previous is not None:
+                self._keys[athlete_key(previous)].remove(reference_id)
+            self.athletes[reference_id] = athlete
+            self._keys.setdefault(athlete_key(athlete), []).append(
+                reference_id
+            )
+
+    def find(self, athlete: AthleteType) -> list[str]:
+        """Find the reference IDs of an athlete.
+
+        Args:
+            athlete (AthleteType): Athlete.
+
+        Returns:
+            list[str]: Matching reference IDs, more than one when the API has
+                duplicate athletes.
+        """
+        return list(self._keys.get(athlete_key(athlete), []))
+
+    def find_id(self, athlete: AthleteType) -> str | None:
+        """Find the reference ID of an athlete.
+
+        Args:
+            athlete (AthleteType): Athlete.
+
+        Raises:
+            Exception: More than one athlete matches.
+
+        Returns:
+            str | None: Reference ID, or None if the athlete does not exist.
+        """
+        reference_ids = self.find(athlete)
+        if len(reference_ids) > 1:
+            raise Exception(
+                f"Multiple athletes match {athlete}: {reference_ids}"
+            )
+        return reference_ids[0] if reference_ids else None
+
+    def create_athlete(
+        self, first_name: str, last_name: str, yearborn: int
+    ) -> dict:
+        """Create an athlete in the API and add it to the index.
+
+        Args:
+            first_name (str): First name.
+            last_name (str): Last name.
+            yearborn (int): Year born.
+
+        Returns:
+            dict: Created athlete, see `LifterAPI.create_athlete`.
+        """
+        response = self.api.create_athlete(
+            first_name=first_name, last_name=last_name, yearborn=yearborn
+        )
+        self.add(response)
+        return response
+
+    def clear(self) -> None:
+        """Remove every athlete from the index."""
+        with self._lock:
+            self.athletes, self._keys = {}, {}
+            self.synced, self.page_size = 0, None
+
+    def refresh(self) -> int:
+        """Fetch athletes added to the API since the last refresh.
+
+        Starts again from the first page if athletes have been deleted.
+
+        Returns:
+            int: Athletes in the API.
+        """
+        synced = None
+        if self.page_size is not None:
+            synced = sync(
+                self.api.athletes,
+                self.add,
+                self.athletes,
+                self.synced,
+                self.page_size,
+            )
+        if synced is None:
+            self.clear()
+            synced = sync(self.api.athletes, self.add)
+        self.synced, self.page_size = synced
+        self.save()
+        return self.synced
+
+    def load(self) -> None:
+        """Load the index from `index_path`."""
+        with open(self.index_path) as f:
+            data = json.load(f)
+        self.synced = data["synced"]
+        self.page_size = data["page_size"]
+        for reference_id, athlete in data["athletes"].items():
+            self.add({**athlete, "reference_id": reference_id})
+
+    def save(self) -> None:
+        """Write the index to `index_path`, if set."""
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with self._lock:
+            data = {
+                "synced": self.synced,
+                "page_size": self.page_size,
+                "athletes": self.athletes,
+            }
+            with open(temp_path, "w") as f:
+                json.dump(data, f)
+        os.replace(temp_path, self.index_path)
@@ -0,0 +1,187 @@
+"""Command line interface.
+
+>>> python ./src/parsing-competition-results parse ./data --jobs 8
+"""
+
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import typer
+
+from file import CompetitionFile
+from textract import TextractCompetitionFile
+from utils.cache import ParseCache
+from utils.timing import PROFILE_ENV, TIMINGS
+
+BASE_DIR = Path(__file__).parent.parent.parent
+
+# saved Textract responses of a PDF, see `textract`
+TEXTRACT_SUFFIX = ".textract.json"
+# directory of paged Textract responses of a PDF
+TEXTRACT_DIR_SUFFIX = ".textract"
+
+app = typer.Typer()
+
+
+@app.callback()
+def callback() -> None:
+    """Parse competition results files."""
+
+
+def list_competition_files(data_dir: Path) -> list[Path]:
+    """Provide the files found in data/<year>/<competition>/.
+
+    Args:
+        data_dir (Path): Data directory.
+
+    Returns:
+        list[Path]: Excel files, saved Textract responses and directories
+            of them, sorted.
+    """
+    return sorted(
+        file
+        for directory in data_dir.iterdir()
+        if directory.is_dir()
+        for pattern in (
+            "**/*.xls",
+            "**/*.xlsx",
+            f"**/*{TEXTRACT_SUFFIX}",
+            f"**/*{TEXTRACT_DIR_SUFFIX}",
+        )
+        for file in directory.glob(pattern)
+        if file.is_dir() == pattern.endswith(TEXTRACT_DIR_SUFFIX)
+    )
+
+
+def is_textract(file_path: Path) -> bool:
+    """Check whether a path holds saved Textract responses.
+
+    Args:
+        file_path (Path): Path from `list_competition_files`.
+
+    Returns:
+        bool: A response ending in `TEXTRACT_SUFFIX`, or a directory of
+            them ending in `TEXTRACT_DIR_SUFFIX`.
+    """
+    if file_path.is_dir():
+        return file_path.name.endswith(TEXTRACT_DIR_SUFFIX)
+    return file_path.name.endswith(TEXTRACT_SUFFIX)
+
+
+def output_path(file_path: Path, data_dir: Path, output_dir: Path) -> Path:
+    """Provide where to write a parsed file.
+
+    The file's name is kept, suffix included, so "results.xls" and
+    "results.xlsx" in the same folder are not written to the same file.
+
+    Args:
+        file_path (Path): File under `data_dir`.
+        data_dir (Path): Data directory.
+        output_dir (Path): Output directory.
+
+    Returns:
+        Path: e.g. "<output_dir>/2022/comp/results.xlsx.json".
+    """
+    relative = file_path.relative_to(data_dir)
+    return output_dir / relative.parent / f"{relative.name}.json"
+
+
+def parse_file(
+    file_path: Path,
+    output_path: Path,
+    file_type: str,
+    cache: ParseCache | None = None,
+) -> Path:
+    """Parse a file and write its competition, athletes and lifts as JSON.
+
+    Args:
+        file_path (Path): Excel file, or Textract responses, see
+            `is_textract`.
+        output_path (Path): JSON file to write.
+        file_type (str): Software type, see `file.FILE_TYPES`. Detected
+            when empty.
+        cache (ParseCache | None): On-disk cache of parsed files.
+
+    Returns:
+        Path: JSON file written.
+    """
+    if is_textract(file_path):
+        comp = TextractCompetitionFile(file_path, file_type, cache=cache)
+    else:
+        comp = CompetitionFile(file_path, file_type, cache=cache)
+    result = {
+        "competition": comp.competition,
+        "athletes": comp.athletes,
+        "lifts": comp.lifts,
+    }
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(result, f, indent=2, default=str)
+    return output_path
+
+
+@app.command()
+def parse(
+    data_dir: Path = typer.Argument(BASE_DIR / "data"),
+    output_dir: Path = typer.Option(BASE_DIR / "parsed", "--output", "-o"),
+    jobs: int = typer.Option(os.cpu_count(), "--jobs", "-j"),
+    file_type: str = typer.Option(
+        "", "--file-type", help="Software type, detected when not given."
+    ),
+    cache_dir: Path = typer.Option(BASE_DIR / ".cache", "--cache-dir"),
+    no_cache: bool = typer.Option(False, "--no-cache"),
+) -> None:
+    """Parse every results file under DATA_DIR in parallel."""
+    files = list_competition_files(data_dir)
+    cache = None if no_cache else ParseCache(cache_dir)
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                parse_file,
+                file,
+                output_path(file, data_dir, output_dir),
+                file_type,
+                cache,
+            ): file
+            for file in files
+        }
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                typer.echo(f"{file} -> {future.result()}")
+            except Exception as e:
+                failed += 1
+                typer.echo(f"{file} FAILED: {e}", err=True)
+    typer.echo(f"Parsed {len(files) - failed} of {len(files)} files.")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def timings(
+    file_path: Path,
+    output_path: Path = typer.Option(Path("timings.json"), "--output", "-o"),
+    file_type: str = typer.Option(
+        "", "--file-type", help="Software type, detected when not given."
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Profile time and memory of each stage."
+    ),
+) -> None:
+    """Parse FILE_PATH without the cache and write its stage timings."""
+    if profile:
+        os.environ[PROFILE_ENV] = "1"
+    TIMINGS.reset()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parse_file(file_path, Path(tmp_dir) / "parsed.json", file_type)
+    TIMINGS.to_json(output_path)
+    for stage, timing in TIMINGS.summary().items():
+        typer.echo(
+            f"{stage}: {timing['count']} in {timing['total']:.3f}s "
+            f"(p50 {timing['p50']:.4f}s, p95 {timing['p95']:.4f}s)"
+        )
+    typer.echo(f"Timings written to {output_path}.")
@@ -0,0 +1,392 @@
+"""Lifter API client sharing one keep-alive session."""
+
+import asyncio
+import functools
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from lifter_api import LifterAPI
+from lifter_api.utils.helpers import verify_date, verify_lifts
+from requests.adapters import HTTPAdapter
+
+from utils.timing import span
+
+# connections kept open to the API
+POOL_SIZE = 16
+# requests started per second by `AsyncLifterAPI`
+RATE = 100.0
+
+
+def _endpoint(path: str) -> str:
+    """Name the endpoint of a path, e.g. "competitions/{id}/lifts"."""
+    return "/".join(
+        "{id}" if i % 2 else part for i, part in enumerate(path.split("/"))
+    )
+
+
+class PooledLifterAPI(LifterAPI):
+    """`LifterAPI` that reuses connections and access tokens.
+
+    `LifterAPI` opens a new connection for every request and verifies the
+    access token before every authorised request. This sends the endpoints
+    used by the app through one pooled `requests.Session`, which is safe to
+    share between threads, and only refreshes the access token when the API
+    rejects it. Errors are raised as `requests.HTTPError`, as in
+    `LifterAPI`.
+
+    >>> api = PooledLifterAPI(auth_token=os.getenv("API_TOKEN"))
+    >>> api.create_lift(competition_id="ab345l", athlete_id="123def7", **lift)
+    """
+
+    def __init__(self, *args, pool_size: int = POOL_SIZE, **kwargs) -> None:
+        self._session = requests.Session()
+        self.pool_size = pool_size
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._authorization_header = None
+        super().__init__(*args, **kwargs)
+
+    def _request(
+        self, method: str, path: str, auth: bool = False, **kwargs
+    ) -> requests.Response:
+        """Send a request through the shared session.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Path after the API version, e.g. "athletes".
+            auth (bool): Send the authorization header.
+            **kwargs: Passed on to `requests.Session.request`.
+
+        Raises:
+            requests.HTTPError: Error status returned.
+
+        Returns:
+            requests.Response: Response.
+        """
+        url = f"{self._url}/{self._version}/{path}"
+        with span(f"api.{method} {_endpoint(path)}"):
+            return self._send(method, url, auth, **kwargs)
+
+    def _send(
+        self, method: str, url: str, auth: bool, **kwargs
+    ) -> requests.Response:
+        """Send a request, refreshing an expired access token once."""
+        if not auth:
+            response = self._session.request(method, url, **kwargs)
+        else:
+            if self._authorization_header is None:
+                self._authorization_header = (
+                    self._provide_authorization_header()
+                )
+            response = self._session.request(
+                method, url, headers=self._authorization_header, **kwargs
+            )
+            if response.status_code == 401:
+                # access token expired
+                self._authorization_header = (
+                    self._provide_authorization_header()
+                )
+                response = self._session.request(
+                    method, url, headers=self._authorization_header, **kwargs
+                )
+        response.raise_for_status()
+        return response
+
+    def athletes(self, page: int | None = 1) -> dict:
+        """List all athletes, see `LifterAPI.athletes`."""
+        return self._request("GET", "athletes", params={"page": page}).json()
+
+    def find_athlete(
+        self,
+        search: str,
+        page: int = 1,
+        ordering: str = "last_name",
+        ascending: bool = True,
+    ) -> dict:
+        """Search for an athlete, see `LifterAPI.find_athlete`."""
+        params = {
+            "ordering": f"{'' if ascending else '-'}{ordering}",
+            "page": page,
+            "search": search,
+        }
+        return self._request("GET", "athletes", params=params).json()
+
+    def create_athlete(
+        self, first_name: str, last_name: str, yearborn: int
+    ) -> dict:
+        """Create an athlete, see `LifterAPI.create_athlete`."""
+        return self._request(
+            "POST",
+            "athletes",
+            auth=True,
+            json={
+                "first_name": str(first_name),
+                "last_name": str(last_name),
+                "yearborn": int(yearborn),
+            },
+        ).json()
+
+    def delete_athlete(self, athlete_id: str) -> dict:
+        """Delete an athlete, see `LifterAPI.delete_athlete`."""
+        self._request("DELETE", f"athletes/{athlete_id}", auth=True)
+        return {"detail": f"Athlete ID: '{athlete_id}' deleted."}
+
+    def competitions(self, page: int = 1) -> dict:
+        """List all competitions, see `LifterAPI.competitions`."""
+        return self._request(
+            "GET", "competitions", params={"page": page}
+        ).json()
+
+    def get_competition(self, competition_id: str) -> dict:
+        """Get a competition, see `LifterAPI.get_competition`."""
+        try:
+            return self._request(
+                "GET", f"competitions/{competition_id}"
+            ).json()
+        except requests.HTTPError as e:
+            if e.response.status_code == 404:
+                return {
+                    "detail": (
+                        f"Competition ID: '{competition_id}' does not exist."
+                    )
+                }
+            raise
+
+    def create_competition(
+        self, date_start: str, date_end: str, location: str, name: str
+    ) -> dict:
+        """Create a competition, see `LifterAPI.create_competition`."""
+        return self._request(
+            "POST",
+            "competitions",
+            auth=True,
+            json={
+                "date_start": verify_date(date_start),
+                "date_end": verify_date(date_end),
+                "location": str(location),
+                "name": str(name),
+            },
+        ).json()
+
+    def delete_competition(self, competition_id: str) -> dict:
+        """Delete a competition, see `LifterAPI.delete_competition`."""
+        self._request("DELETE", f"competitions/{competition_id}", auth=True)
+        return {"detail": f"Competition ID: '{competition_id}' entry deleted."}
+
+    def lifts(self, competition_id: str) -> list[dict]:
+        """List a competition's lifts, see `LifterAPI.lifts`."""
+        return self._request(
+            "GET", f"competitions/{competition_id}/lifts"
+        ).json()
+
+    def delete_lift(self, competition_id: str, lift_id: str) -> dict:
+        """Delete a lift, see `LifterAPI.delete_lift`."""
+        self._request(
+            "DELETE",
+            f"competitions/{competition_id}/lifts/{lift_id}",
+            auth=True,
+        )
+        return {"detail": f"Lift ID: '{lift_id}' entry deleted."}
+
+    def create_lift(
+        self,
+        competition_id: str,
+        athlete_id: str,
+        snatch_first: str,
+        snatch_first_weight: int,
+        snatch_second: str,
+        snatch_second_weight: int,
+        snatch_third: str,
+        snatch_third_weight: int,
+        cnj_first: str,
+        cnj_first_weight: int,
+        cnj_second: str,
+        cnj_second_weight: int,
+        cnj_third: str,
+        cnj_third_weight: int,
+        bodyweight: float,
+        weight_category: str,
+        team: str,
+        lottery_number: int,
+        session_number: int,
+    ) -> dict:
+        """Create a lift, see `LifterAPI.create_lift`.
+
+        Unlike `LifterAPI.create_lift`, the athlete and competition are not
+        looked up first; a missing one is reported by the API as an error.
+        """
+        verify_lifts(
+            (str(snatch_first), int(snatch_first_weight)),
+            (str(snatch_second), int(snatch_second_weight)),
+            (str(snatch_third), int(snatch_third_weight)),
+        )
+        verify_lifts(
+            (str(cnj_first), int(cnj_first_weight)),
+            (str(cnj_second), int(cnj_second_weight)),
+            (str(cnj_third), int(cnj_third_weight)),
+        )
+        return self._request(
+            "POST",
+            f"competitions/{competition_id}/lifts",
+            auth=True,
+            json={
+                "competition": competition_id,
+                "athlete": athlete_id,
+                "snatch_first": snatch_first,
+                "snatch_first_weight": snatch_first_weight,
+                "snatch_second": snatch_second,
+                "snatch_second_weight": snatch_second_weight,
+                "snatch_third": snatch_third,
+                "snatch_third_weight": snatch_third_weight,
+                "cnj_first": cnj_first,
+                "cnj_first_weight": cnj_first_weight,
+                "cnj_second": cnj_second,
+                "cnj_second_weight": cnj_second_weight,
+                "cnj_third": cnj_third,
+                "cnj_third_weight": cnj_third_weight,
+                "bodyweight": float(bodyweight),
+                "weight_category": str(weight_category),
+                "session_number": int(session_number),
+                "team": str(team),
+                "lottery_number": int(lottery_number),
+            },
+        ).json()
+
+
+class RateLimit:
+    """Spaces out requests so no more than `rate` start each second.
+
+    >>> limit = RateLimit(10)
+    >>> await limit.wait()
+    """
+
+    def __init__(
+        self, rate: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.interval = 1 / rate
+        self.clock = clock
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        """Wait for the next free slot."""
+        now = self.clock()
+        start = max(now, self._next)
+        self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class AsyncLifterAPI:
+    """asyncio facade over `PooledLifterAPI`.
+
+    Each call runs the blocking request in a thread pool sized to
+    `concurrency`, so that many requests can be in flight over the
+    client's keep-alive session. `concurrency` defaults to the client's
+    `pool_size`, as more threads than pooled connections would open
+    connections that are then discarded. With a `rate`, no more than that
+    many requests start each second. Errors are raised as
+    `requests.HTTPError`, as in `PooledLifterAPI`.
+
+    >>> async with AsyncLifterAPI(PooledLifterAPI(pool_size=64)) as api:
+    ...     pages = await asyncio.gather(
+    ...         *(api.athletes(page) for page in range(1, 11))
+    ...     )
+    """
+
+    def __init__(
+        self,
+        api: PooledLifterAPI,
+        concurrency: int | None = None,
+        rate: float | None = RATE,
+    ) -> None:
+        if concurrency is None:
+            concurrency = api.pool_size
+        self.api = api
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._rate_limit = None if rate is None else RateLimit(rate)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def __aenter__(self) -> "AsyncLifterAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the threads once their requests finish."""
+        self._executor.shutdown(wait=False)
+
+    async def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking call within the concurrency and rate limits.
+
+        Args:
+            func (Callable[..., Any]): Blocking call, e.g. a client method
+                wrapped in `upload.retry`.
+            *args: Arguments for the call.
+            **kwargs: Keyword arguments for the call.
+
+        Raises:
+            requests.HTTPError: Error status returned.
+
+        Returns:
+            Any: Result of the call.
+        """
+        async with self._semaphore:
+            if self._rate_limit is not None:
+                await self._rate_limit.wait()
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def athletes(self, page: int | None = 1) -> dict:
+        """List all athletes, see `LifterAPI.athletes`."""
+        return await self.call(self.api.athletes, page)
+
+    async def find_athlete(self, search: str, **kwargs) -> dict:
+        """Search for an athlete, see `LifterAPI.find_athlete`."""
+        return await self.call(self.api.find_athlete, search, **kwargs)
+
+    async def create_athlete(
+        self, first_name: str, last_name: str, yearborn: int
+    ) -> dict:
+        """Create an athlete, see `LifterAPI.create_athlete`."""
+        return await self.call(
+            self.api.create_athlete, first_name, last_name, yearborn
+        )
+
+    async def delete_athlete(self, athlete_id: str) -> dict:
+        """Delete an athlete, see `LifterAPI.delete_athlete`."""
+        return await self.call(self.api.delete_athlete, athlete_id)
+
+    async def competitions(self, page: int = 1) -> dict:
+        """List all competitions, see `LifterAPI.competitions`."""
+        return await self.call(self.api.competitions, page)
+
+    async def get_competition(self, competition_id: str) -> dict:
+        """Get a competition, see `LifterAPI.get_competition`."""
+        return await self.call(self.api.get_competition, competition_id)
+
+    async def create_competition(self, **competition) -> dict:
+        """Create a competition, see `LifterAPI.create_competition`."""
+        return await self.call(self.api.create_competition, **competition)
+
+    async def delete_competition(self, competition_id: str) -> dict:
+        """Delete a competition, see `LifterAPI.delete_competition`."""
+        return await self.call(self.api.delete_competition, competition_id)
+
+    async def lifts(self, competition_id: str) -> list[dict]:
+        """List a competition's lifts, see `LifterAPI.lifts`."""
+        return await self.call(self.api.lifts, competition_id)
+
+    async def delete_lift(self, competition_id: str, lift_id: str) -> dict:
+        """Delete a lift, see `LifterAPI.delete_lift`."""
+        return await self.call(self.api.delete_lift, competition_id, lift_id)
+
+    async def create_lift(self, **lift) -> dict:
+        """Create a lift, see `PooledLifterAPI.create_lift`."""
+        return await self.call(self.api.create_lift, **lift)
@@ -0,0 +1,166 @@
+"""Cached catalogue of the competitions in the lifter-api."""
+
+import threading
+import time
+from collections.abc import Callable
+
+from lifter_api import LifterAPI
+
+from athletes import normalize_name
+from utils.pagination import WORKERS, sync
+
+# seconds before the catalogue is refreshed again
+TTL = 300
+
+
+class CompetitionCatalogue:
+    """Competitions in the lifter-api, by start date and name.
+
+    The competition list is fetched once, with the pages after the first
+    fetched concurrently, then refreshed at most every `ttl` seconds. A
+    refresh only fetches the pages from the last one seen, as the API lists
+    competitions in the order they were created, and falls back to a full
+    resync if the competitions known no longer match the count.
+
+    >>> competitions = CompetitionCatalogue(api)
+    >>> competitions.find(date_start="2022-06-04")
+    [{'reference_id': 'ab345l', 'name': '2022 NZ Open', ...}]
+    """
+
+    def __init__(
+        self,
+        api: LifterAPI,
+        ttl: float = TTL,
+        workers: int = WORKERS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.api = api
+        self.ttl = ttl
+        self.workers = workers
+        self.clock = clock
+        self.competitions: dict[str, dict] = {}
+        # competitions consumed from the API listing, and its page size
+        self.synced = 0
+        self.page_size = None
+        self.refreshed_at = None
+        self._by_date: dict[str, list[str]] = {}
+        self._by_name: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.competitions)
+
+    @property
+    def stale(self) -> bool:
+        """Whether the catalogue is older than `ttl`."""
+        return (
+            self.refreshed_at is None
+            or self.clock() - self.refreshed_at > self.ttl
+        )
+
+    def add(self, competition: dict) -> None:
+        """Add or update a competition from the API.
+
+        Args:
+            competition (dict): Competition with its "reference_id".
+        """
+        reference_id = competition["reference_id"]
+        with self._lock:
+            self._remove(reference_id)
+            self.competitions[reference_id] = competition
+            self._by_date.setdefault(
+                str(competition["date_start"]), []
+            ).append(reference_id)
+            self._by_name.setdefault(
+                normalize_name(competition["name"]), []
+            ).append(reference_id)
+
+    def _remove(self, reference_id: str) -> None:
+        previous = self.competitions.pop(reference_id, None)
+        if previous is not None:
+            self._by_date[str(previous["date_start"])].remove(reference_id)
+            self._by_name[normalize_name(previous["name"])].remove(
+                reference_id
+            )
+
+    def find(
+        self, date_start: str | None = None, name: str | None = None
+    ) -> list[dict]:
+        """Find competitions by start date and/or name, refreshing if stale.
+
+        Args:
+            date_start (str | None): Start date, YYYY-MM-DD.
+            name (str | None): Name, ignoring case and accents.
+
+        Returns:
+            list[dict]: Matching competitions.
+        """
+        if self.stale:
+            self.refresh()
+        reference_ids = None
+        if date_start is not None:
+            reference_ids = self._by_date.get(str(date_start), [])
+        if name is not None:
+            by_name = self._by_name.get(normalize_name(name), [])
+            reference_ids = (
+                by_name
+                if reference_ids is None
+                else [r for r in reference_ids if r in by_name]
+            )
+        if reference_ids is None:
+            reference_ids = list(self.competitions)
+        return [self.competitions[r] for r in reference_ids]
+
+    def create_competition(self, **competition: str) -> dict:
+        """Create a competition in the API and add it to the catalogue.
+
+        Args:
+            **competition (str): Competition fields, see `CompetitionType`.
+
+        Returns:
+            dict: Created competition.
+        """
+        response = self.api.create_competition(**competition)
+        self.add(response)
+        return response
+
+    def clear(self) -> None:
+        """Remove every competition from the catalogue."""
+        with self._lock:
+            self.competitions, self._by_date, self._by_name = {}, {}, {}
+            self.synced, self.page_size = 0, None
+
+    def refresh(self) -> int:
+        """Fetch competitions added to the API since the last refresh.
+
+        Returns:
+            int: Competitions in the API.
+        """
+        synced = None
+        if self.page_size is not None:
+            synced = sync(
+                self.api.competitions,
+                self.add,
+                self.competitions,
+                self.synced,
+                self.page_size,
+                self.workers,
+            )
+        if synced is None:
+            return self.resync()
+        self.synced, self.page_size = synced
+        self.refreshed_at = self.clock()
+        return self.synced
+
+    def resync(self) -> int:
+        """Fetch every competition, fetching pages concurrently.
+
+        Returns:
+            int: Competitions in the API.
+        """
+        self.clear()
+        self.synced, self.page_size = sync(
+            self.api.competitions, self.add, workers=self.workers
+        )
+        self.refreshed_at = self.clock()
+        return self.synced
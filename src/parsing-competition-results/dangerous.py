@@ -1,35 +1,159 @@
 """Dangerous functions."""
 
+import warnings
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
 
-def nuke_athlete(api: LifterAPI, confirm: bool = False) -> None:
-    """Delete all athletes."""
-    if confirm is True:
-        athletes = []
-        next = "page=1"
-        while next is not None:
-            new_page = next.split("page=")[-1]
-            response = api.athletes(page=new_page)
-            athletes.extend(response["results"])
-            next = response["next"]
-        for athlete in athletes:
-            response = api.delete_athlete(athlete["reference_id"])
-            print(response)
+import requests
+from lifter_api import LifterAPI
+
+from upload import retry
+from utils.pagination import Paginator
+
+# deletes in flight at once
+WORKERS = 8
+
+
+@dataclass(slots=True)
+class DeleteReport:
+    """Counts from a bulk delete."""
+
+    listed: int = 0
+    deleted: int = 0
+    # in the checkpoint, or already gone when deleted
+    skipped: int = 0
+    dry_run: bool = False
+
+
+def _delete(delete: Callable[[str], dict], reference_id: str) -> bool:
+    """Delete a record, False if it no longer exists."""
+    try:
+        retry(delete, reference_id)
+    except requests.HTTPError as e:
+        if e.response.status_code != 404:
+            raise
+        return False
+    return True
+
+
+def delete_all(
+    list_page: Callable[..., dict],
+    delete: Callable[[str], dict],
+    dry_run: bool = False,
+    checkpoint: Path | None = None,
+    workers: int = WORKERS,
+) -> DeleteReport:
+    """Delete every record of a paginated resource.
+
+    Pages are listed last page first, so records are deleted as their page
+    arrives without shifting the pages still to come. Deleted reference
+    IDs are appended to `checkpoint`, which is removed once everything is
+    deleted; if interrupted, run again with the same checkpoint to carry on.
+
+    >>> delete_all(api.athletes, api.delete_athlete, dry_run=True)
+    DeleteReport(listed=812, deleted=0, skipped=0, dry_run=True)
+
+    Args:
+        list_page (Callable[..., dict]): Fetches a page, e.g.
+            `LifterAPI.athletes`.
+        delete (Callable[[str], dict]): Deletes a record by reference ID,
+            e.g. `LifterAPI.delete_athlete`.
+        dry_run (bool): Only count the records that would be deleted.
+        checkpoint (Path | None): File of deleted reference IDs.
+        workers (int): Deletes and page fetches in flight at once.
+
+    Returns:
+        DeleteReport: Counts of records listed, deleted and skipped.
+    """
+    report = DeleteReport(dry_run=dry_run)
+    done = set()
+    if checkpoint is not None and checkpoint.exists():
+        done = set(checkpoint.read_text().split())
+    log = None
+    if checkpoint is not None and not dry_run:
+        checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        log = open(checkpoint, "a")
+    errors = []
+
+    def record(futures: set) -> None:
+        for future in futures:
+            try:
+                reference_id, deleted = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            if deleted:
+                report.deleted += 1
+            else:
+                report.skipped += 1
+            if log is not None:
+                log.write(f"{reference_id}\n")
+                log.flush()
+
+    def run(reference_id: str) -> tuple[str, bool]:
+        return reference_id, _delete(delete, reference_id)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for item in Paginator(list_page, workers=workers, reverse=True):
+                if errors:
+                    break
+                report.listed += 1
+                if item["reference_id"] in done:
+                    report.skipped += 1
+                    continue
+                if dry_run:
+                    continue
+                pending.add(executor.submit(run, item["reference_id"]))
+                if len(pending) >= 2 * workers:
+                    finished, pending = wait(
+                        pending, return_when=FIRST_COMPLETED
+                    )
+                    record(finished)
+            # including deletes still in flight after an error
+            record(wait(pending).done)
+    finally:
+        if log is not None:
+            log.close()
+    if errors:
+        raise errors[0]
+    if checkpoint is not None and not dry_run:
+        checkpoint.unlink(missing_ok=True)
+    return report
+
+
+def nuke_athlete(
+    api: LifterAPI,
+    confirm: bool = False,
+    dry_run: bool = False,
+    checkpoint: Path | None = None,
+) -> DeleteReport | None:
+    """Delete all athletes, see `delete_all`."""
+    if confirm is True or dry_run is True:
+        report = delete_all(
+            api.athletes, api.delete_athlete, dry_run, checkpoint
+        )
+        print(report)
+        return report
     else:
-        print_warning("Please set confirm=True flag.")
-
-
-def nuke_competitions(api: LifterAPI, confirm: bool = False) -> None:
-    """Delete all competitions."""
-    if confirm is True:
-        competitions = []
-        next = "page=1"
-        while next is not None:
-            new_page = next.split("page=")[-1]
-            response = api.competitions(page=new_page)
-            competitions.extend(response["results"])
-            next = response["next"]
-        for competition in competitions:
-            response = api.delete_competition(competition["reference_id"])
-            print(response)
+        warnings.warn("Please set confirm=True flag.")
+
+
+def nuke_competitions(
+    api: LifterAPI,
+    confirm: bool = False,
+    dry_run: bool = False,
+    checkpoint: Path | None = None,
+) -> DeleteReport | None:
+    """Delete all competitions, see `delete_all`."""
+    if confirm is True or dry_run is True:
+        report = delete_all(
+            api.competitions, api.delete_competition, dry_run, checkpoint
+        )
+        print(report)
+        return report
     else:
-        print_warning("Please set confirm=True flag.")
+        warnings.warn("Please set confirm=True flag.")
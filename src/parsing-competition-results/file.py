@@ -3,48 +3,395 @@
 # file_path is location of as a Path object
 # file type to be the software type (e.g. OWLCMS, Excel)
 
-import datetime
+import io
+import itertools
+import math
+import os
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
 
+import openpyxl
 import pandas as pd
-import streamlit as st
+from openpyxl.utils.exceptions import InvalidFileException
 
-from utils.helpers import (
-    convert_date,
-    parse_lift_number,
-    determine_lift,
-    parse_weight_category,
-    name_parser,
-    parse_weight_category_excelmacro,
-)
+from parsers import OWLCMS_ATTEMPT_COLUMNS, PARSERS
+from utils.helpers import convert_date, determine_lift, parse_lift_number
+from utils.cache import ParseCache, file_digest
+from utils.timing import span
+from utils.types import LiftRecord
 
-FILE_TYPES = ["owlcms", "excelmacro"]
+# built-in file types; `parsers.PARSERS` also has any registered later
+FILE_TYPES = tuple(PARSERS)
+
+# bump when the parsed output changes so cached results are not reused
+PARSER_VERSION = "1"
+
+ATTEMPT_FIELDS = list(OWLCMS_ATTEMPT_COLUMNS)
+
+# manual lift mapping conversions, one row per cell
+DIAGNOSTIC_COLUMNS = [
+    "row",
+    "field",
+    "column",
+    "value",
+    "dtype",
+    "result",
+    "error",
+]
+
+
+def _convert_mapped(field: str, cell: Any) -> dict[str, Any]:
+    """Convert a manually mapped cell to its lift fields.
+
+    Args:
+        field (str): Lift (or athlete) field the cell is mapped to.
+        cell (Any): Cell value.
+
+    Returns:
+        dict[str, Any]: Lift fields, e.g. a status and weight for attempts.
+    """
+    if field in ATTEMPT_FIELDS:
+        return {
+            field: determine_lift(cell),
+            f"{field}_weight": parse_lift_number(cell),
+        }
+    if field == "bodyweight":
+        return {field: float(cell)}
+    return {field: cell}
+
+
+def _cell_value(value: Any) -> Any:
+    """Convert an openpyxl value as `pd.read_excel` would.
+
+    Args:
+        value (Any): Cell value.
+
+    Returns:
+        Any: NaN for empty cells and int for whole numbers.
+    """
+    if value is None:
+        return math.nan
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _column_labels(header: tuple, width: int) -> list:
+    """Label columns as `pd.read_excel` would.
+
+    Args:
+        header (tuple): Header row values.
+        width (int): Number of columns.
+
+    Returns:
+        list: "Unnamed: i" for blank headers, "name.1" for duplicates.
+    """
+    labels = []
+    seen = {}
+    for i in range(width):
+        label = header[i] if i < len(header) else None
+        if label is None or label == "":
+            label = f"Unnamed: {i}"
+        elif label in seen:
+            seen[label] += 1
+            label = f"{label}.{seen[label]}"
+        else:
+            seen[label] = 0
+        labels.append(label)
+    return labels
+
+
+def _sheet_key(
+    sheetname: str,
+    usecols: tuple[str, ...] | None,
+    dtype: dict[str, Any] | type | None,
+    nrows: int | None,
+) -> tuple:
+    """Key a parsed sheet on how it was read, see `sheet`."""
+    if isinstance(dtype, dict):
+        dtype = tuple(dtype.items())
+    return (sheetname, usecols, dtype, nrows)
+
+
+@span("file.parse_sheet")
+def _parse_sheet(
+    workbook: pd.ExcelFile,
+    sheetname: str,
+    usecols: tuple[str, ...] | None,
+    dtype: dict[str, Any] | type | None,
+    nrows: int | None,
+) -> pd.DataFrame:
+    """Parse a sheet, see `sheet`."""
+    return workbook.parse(
+        sheetname,
+        usecols=None if usecols is None else set(usecols).__contains__,
+        dtype=dtype,
+        nrows=nrows,
+    )
+
+
+def _parse_sheets(
+    source: Path | bytes,
+    sheetnames: list[str],
+    usecols: tuple[str, ...] | None,
+    dtype: dict[str, Any] | type | None,
+    nrows: int | None,
+) -> list[pd.DataFrame]:
+    """Open a file and parse some of its sheets, in a worker process.
+
+    Args:
+        source (Path | bytes): File path, or the contents of an uploaded
+            file.
+        sheetnames (list[str]): Sheets to parse.
+        usecols (tuple[str, ...] | None): Columns to read, see `sheet`.
+        dtype (dict[str, Any] | type | None): Dtypes, see `sheet`.
+        nrows (int | None): Rows to read, see `sheet`.
+
+    Returns:
+        list[pd.DataFrame]: A dataframe for each sheet, in order.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with pd.ExcelFile(source) as workbook:
+        return [
+            _parse_sheet(workbook, sheetname, usecols, dtype, nrows)
+            for sheetname in sheetnames
+        ]
 
 
 class BaseCompetitionFile:
-    """Base methods for CompetitionFile."""
+    """Base methods for CompetitionFile.
+
+    The Excel file is opened once and each sheet is parsed once; both are
+    kept until the file on disk changes.
+    """
+
+    _workbook = None
+    _workbook_key = None
+    _sheets: dict[tuple, pd.DataFrame]
+    # processes `extract` parses sheets in, 1 to parse them in turn
+    workers = 1
+
+    @property
+    def file_key(self) -> tuple:
+        """Identify the current version of the file.
+
+        Returns:
+            tuple: File path, modification time and size.
+        """
+        try:
+            stat = os.stat(self.file_path)
+        except TypeError:
+            # uploaded files are held in memory and never change
+            return (id(self.file_path),)
+        return (str(self.file_path), stat.st_mtime_ns, stat.st_size)
+
+    def digest(self) -> str:
+        """Hash the contents of the file.
+
+        Returns:
+            str: SHA-256 hex digest, see `utils.cache.file_digest`.
+        """
+        return file_digest(self.file_path)
+
+    @property
+    def workbook(self) -> pd.ExcelFile:
+        """Provide the opened Excel file, reopening it if it has changed.
+
+        Returns:
+            pd.ExcelFile: Opened Excel file.
+        """
+        key = self.file_key
+        if self._workbook is None or key != self._workbook_key:
+            if self._workbook is not None:
+                self._workbook.close()
+            self._workbook = pd.ExcelFile(self.file_path)
+            self._workbook_key = key
+            self._sheets = {}
+        return self._workbook
 
     @property
+    @span("file.sheetnames")
     def sheetnames(self) -> list[str]:
         """Provide a list of sheetnames in the Excel file.
 
         Results:
             list[str]: List of sheetnames of Excel file.
         """
-        return pd.ExcelFile(self.file_path).sheet_names
+        return self.workbook.sheet_names
 
-    def extract(self, *args) -> pd.DataFrame:
+    def sheet(
+        self,
+        sheetname: str,
+        usecols: tuple[str, ...] | None = None,
+        dtype: dict[str, Any] | type | None = None,
+        nrows: int | None = None,
+    ) -> pd.DataFrame:
+        """Provide a single sheet, parsing it on first use.
+
+        Each combination of columns, dtypes and rows is parsed once. The
+        first rows of a sheet already parsed in full are not read again.
+
+        Args:
+            sheetname (str): Excel sheetname.
+            usecols (tuple[str, ...] | None): Only read the columns with
+                these labels; labels not in the sheet are ignored.
+            dtype (dict[str, Any] | type | None): Column label to dtype, or
+                one dtype for every column, instead of inferring them.
+            nrows (int | None): Only read this many rows below the header.
+
+        Returns:
+            pd.DataFrame: Pandas dataframe of the sheet.
+        """
+        workbook = self.workbook
+        key = _sheet_key(sheetname, usecols, dtype, nrows)
+        full_key = key[:-1] + (None,)
+        if key not in self._sheets and full_key in self._sheets:
+            return self._sheets[full_key].head(nrows)
+        if key not in self._sheets:
+            self._sheets[key] = _parse_sheet(
+                workbook, sheetname, usecols, dtype, nrows
+            )
+        return self._sheets[key]
+
+    def prefetch(
+        self,
+        sheetnames: Iterable[str],
+        usecols: tuple[str, ...] | None = None,
+        dtype: dict[str, Any] | type | None = None,
+        nrows: int | None = None,
+    ) -> None:
+        """Parse the sheets not yet parsed concurrently, see `workers`.
+
+        Each of up to `workers` processes opens the file and parses an
+        even, contiguous share of the sheets. Worth it for files with many
+        sheets, e.g. excel macro files with a sheet per session; the cost
+        of starting processes and reopening the file outweighs it for a
+        few sheets.
+
+        Args:
+            sheetnames (Iterable[str]): Excel sheetnames.
+            usecols (tuple[str, ...] | None): Columns to read, see `sheet`.
+            dtype (dict[str, Any] | type | None): Dtypes, see `sheet`.
+            nrows (int | None): Rows to read, see `sheet`.
+        """
+        # reopens the file if it has changed, forgetting parsed sheets
+        self.workbook
+        missing = [
+            sheetname
+            for sheetname in dict.fromkeys(sheetnames)
+            if not {
+                _sheet_key(sheetname, usecols, dtype, nrows),
+                _sheet_key(sheetname, usecols, dtype, None),
+            }
+            & self._sheets.keys()
+        ]
+        workers = min(self.workers, len(missing))
+        if workers < 2:
+            return
+        if hasattr(self.file_path, "getvalue"):
+            source = self.file_path.getvalue()
+        else:
+            source = self.file_path
+        shares = [
+            missing[
+                i * len(missing) // workers : (i + 1) * len(missing) // workers
+            ]
+            for i in range(workers)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = executor.map(
+                _parse_sheets,
+                itertools.repeat(source),
+                shares,
+                itertools.repeat(usecols),
+                itertools.repeat(dtype),
+                itertools.repeat(nrows),
+            )
+            for share, dfs in zip(shares, parsed):
+                for sheetname, df in zip(share, dfs):
+                    key = _sheet_key(sheetname, usecols, dtype, nrows)
+                    self._sheets[key] = df
+
+    def detect_file_type(self) -> str:
+        """Determine the software type with each registered parser in turn.
+
+        Returns:
+            str: One of `FILE_TYPES` or "" if not recognised.
+        """
+        for name, parser in PARSERS.items():
+            if parser.detect(self):
+                return name
+        return ""
+
+    @span("file.extract")
+    def extract(
+        self,
+        *args,
+        usecols: tuple[str, ...] | None = None,
+        dtype: dict[str, Any] | type | None = None,
+        nrows: int | None = None,
+    ) -> pd.DataFrame:
         """Extract an information from Excel file given the sheetnames.
 
         Args:
             *args: Excel sheetnames as serperate arguments.
+            usecols (tuple[str, ...] | None): Only read the columns with
+                these labels.
+            dtype (dict[str, Any] | type | None): Dtypes to read columns
+                as, see `sheet`.
+            nrows (int | None): Only read this many rows of each sheet.
 
         Result:
             pd.DataFrame: Pandas dataframe concat of sheetnames provided.
         """
-        dfs = (pd.read_excel(self.file_path, arg) for arg in args)
+        if self.workers > 1:
+            self.prefetch(args, usecols, dtype, nrows)
+        dfs = (self.sheet(arg, usecols, dtype, nrows) for arg in args)
         return pd.concat(dfs, ignore_index=True)
 
+    def iter_rows(self, *args) -> Iterator[dict[str, Any]]:
+        """Stream rows from the given sheets one at a time.
+
+        The streaming counterpart of `extract`: rows are read lazily with
+        openpyxl's read-only mode and labelled like `extract`'s columns, so
+        only one row is held in memory. Files openpyxl cannot read (.xls)
+        fall back to one parsed sheet at a time.
+
+        Args:
+            *args: Excel sheetnames as serperate arguments.
+
+        Yields:
+            dict[str, Any]: Column label to value for each row.
+        """
+        try:
+            workbook = openpyxl.load_workbook(
+                self.file_path, read_only=True, data_only=True
+            )
+        except (InvalidFileException, zipfile.BadZipFile):
+            for arg in args:
+                yield from self.workbook.parse(arg).to_dict("records")
+            return
+        try:
+            for arg in args:
+                worksheet = workbook[arg]
+                # the <dimension> tag can be missing or stale, so size rows
+                # by their cells as `pd.read_excel` does
+                worksheet.reset_dimensions()
+                rows = worksheet.iter_rows(values_only=True)
+                header = next(rows, ())
+                labels = _column_labels(header, len(header))
+                for row in rows:
+                    if len(row) > len(labels):
+                        labels = _column_labels(header, len(row))
+                    row += (None,) * (len(labels) - len(row))
+                    yield dict(zip(labels, map(_cell_value, row)))
+        finally:
+            workbook.close()
+
 
 class CompetitionFile(BaseCompetitionFile):
     """Competition data access as a object.
@@ -54,9 +401,21 @@ class CompetitionFile(BaseCompetitionFile):
     >>> {'competition_data': 'as a dictionary'}
     """
 
-    def __init__(self, file_path: Path, file_type: str = "") -> None:
+    def __init__(
+        self,
+        file_path: Path,
+        file_type: str = "",
+        cache: ParseCache | None = None,
+        workers: int = 1,
+    ) -> None:
         self.file_path = file_path
-        self.file_type = file_type.lower()
+        # file version the type was detected for, None when given
+        self._detected_key = None
+        self.file_type = file_type
+        self.cache = cache
+        self.workers = workers
+        self._cached_data = None
+        self._cached_key = None
         self._competition_data = {
             "name": "",
             "location": "",
@@ -64,47 +423,103 @@ class CompetitionFile(BaseCompetitionFile):
             "date_end": "",
         }
         self._lifts_data = []
+        self._lift_diagnostics = pd.DataFrame(columns=DIAGNOSTIC_COLUMNS)
+        self._results_data = None
+        self._results_key = None
 
     @property
+    def file_type(self) -> str:
+        """Provide the software type, detecting it if not given.
+
+        A detected type is detected again once the file changes.
+
+        Returns:
+            str: One of `FILE_TYPES` or "" if not recognised.
+        """
+        self._forget_detected_type()
+        if self._file_type is None:
+            self._file_type = self.detect_file_type()
+            self._detected_key = self.file_key
+        return self._file_type
+
+    @file_type.setter
+    def file_type(self, value: str) -> None:
+        self._file_type = value.lower() or None
+        self._detected_key = None
+
+    def _forget_detected_type(self) -> None:
+        """Forget a detected file type if the file has changed since."""
+        if self._detected_key not in (None, self.file_key):
+            self._file_type = None
+            self._detected_key = None
+
+    def refresh(self) -> None:
+        """Forget the opened file and parsed results so both are read again."""
+        self._workbook_key = None
+        self._results_data = None
+        self._results_key = None
+        self._cached_key = None
+
+    def _cached(self) -> dict | None:
+        """Provide the parsed file from the on-disk cache.
+
+        The cache is keyed on the file contents and `PARSER_VERSION`, so a
+        hit needs no Excel parsing at all.
+
+        Returns:
+            dict | None: File type, competition, athletes and lifts, or None
+                if there is no cache or the file is not in it.
+        """
+        if self.cache is None:
+            return None
+        key = self.file_key
+        if key != self._cached_key:
+            self._cached_data = self.cache.get(
+                f"{self.digest()}-{PARSER_VERSION}"
+            )
+            self._cached_key = key
+        cached = self._cached_data
+        self._forget_detected_type()
+        if cached is None or self._file_type not in (
+            None,
+            cached["file_type"],
+        ):
+            return None
+        if self._file_type is None:
+            self._file_type = cached["file_type"]
+            self._detected_key = key
+        return cached
+
+    def _store(self) -> None:
+        """Save the parsed file to the on-disk cache."""
+        if self.cache is None or self.file_type not in PARSERS:
+            return
+        self._cached_data = {
+            "file_type": self.file_type,
+            "competition": self.competition,
+            **self._results_data,
+        }
+        self._cached_key = self.file_key
+        self.cache.put(
+            f"{self.digest()}-{PARSER_VERSION}",
+            self._cached_data,
+        )
+
+    @property
+    @span("file.competition")
     def competition(self) -> dict[str, str]:
         """Provide competition data from excel file.
 
         Returns:
              dict[str, str]: Competition data.
         """
-        if self.file_type == FILE_TYPES[0]:
-            COMPETITION_SHEETNAME = "Competition"
-            df = self.extract(COMPETITION_SHEETNAME)
-            dates = []
-            for _, item in df["Unnamed: 3"].iteritems():
-                if isinstance(item, str) and "Weigh-in" in item:
-                    dates.append(item.split(" ")[2])
-            dates.sort(reverse=True)
-            competition = {
-                "name": df.columns[1],
-                "location": df.iloc[0][1],
-                "date_start": convert_date(df.iloc[1][1]),
-                "date_end": dates[0],
-            }
-            return competition
-        elif self.file_type == FILE_TYPES[1]:
-            df = self.extract(*self.sheetnames)
-            dates = [
-                item
-                for _, item in df["Unnamed: 1"].iteritems()
-                if isinstance(item, datetime.datetime)
-            ]
-            dates.sort(reverse=True)
-            competition = {
-                "name": df.columns[0],
-                "date_end": convert_date(dates[0]),
-                "date_start": convert_date(df.iloc[0][1]),
-                "location": df.iloc[0][8],
-            }
-            return competition
-
-        else:
+        cached = self._cached()
+        if cached is not None:
+            return dict(cached["competition"])
+        parser = PARSERS.get(self.file_type)
+        if parser is None:
             return self._competition_data
+        return parser.competition(self)
 
     @competition.setter
     def competition(self, value: dict[str, str]) -> None:
@@ -115,153 +530,59 @@ class CompetitionFile(BaseCompetitionFile):
             "date_end": convert_date(value["date_end"]),
         }
 
-    def _results(self) -> tuple[list[dict], list[dict]]:
-        """Parse to obtain athlete and lift data.
+    def _results(self) -> dict[str, tuple]:
+        """Provide athlete and lift data, parsing once per file version.
 
         Returns:
-            tuple[dict, dict]: Result for athletes and lifts.
+            dict[str, tuple]: Athlete and lift records.
         """
-        athletes = []
-        if self.file_type == FILE_TYPES[0]:
-            LIFT_SHEETNAMES = ["Men's Results", "Women's Results"]
-            df = self.extract(*LIFT_SHEETNAMES)
-            for _, rows in df.iterrows():
-                if type(rows["Lot"]) is int:
-                    athlete = {
-                        "first_name": rows["First Name"],
-                        "last_name": rows["Last Name"],
-                        "yearborn": int(rows["Born"]),
+        key = self.file_key
+        if self._results_data is None or key != self._results_key:
+            with span("file.results"):
+                cached = self._cached()
+                if cached is not None:
+                    self._results_data = {
+                        "athletes": cached["athletes"],
+                        "lifts": cached["lifts"],
                     }
-                    athletes.append(athlete)
-                    self._lifts_data.append(
-                        {
-                            "athlete": athlete,
-                            "lottery_number": rows["Lot"],
-                            "snatch_first": determine_lift(rows["Snatch"]),
-                            "snatch_first_weight": parse_lift_number(
-                                rows["Snatch"]
-                            ),
-                            "snatch_second": determine_lift(
-                                rows["Unnamed: 9"]
-                            ),
-                            "snatch_second_weight": parse_lift_number(
-                                rows["Unnamed: 9"]
-                            ),
-                            "snatch_third": determine_lift(
-                                rows["Unnamed: 10"]
-                            ),
-                            "snatch_third_weight": parse_lift_number(
-                                rows["Unnamed: 10"]
-                            ),
-                            "cnj_first": determine_lift(rows["Clean&Jerk"]),
-                            "cnj_first_weight": parse_lift_number(
-                                rows["Clean&Jerk"]
-                            ),
-                            "cnj_second": determine_lift(rows["Unnamed: 14"]),
-                            "cnj_second_weight": parse_lift_number(
-                                rows["Unnamed: 14"]
-                            ),
-                            "cnj_third": determine_lift(rows["Unnamed: 15"]),
-                            "cnj_third_weight": parse_lift_number(
-                                rows["Unnamed: 15"]
-                            ),
-                            "bodyweight": float(rows["B.W."]),
-                            "weight_category": parse_weight_category(
-                                rows["Cat."]
-                            ),
-                            "team": rows["Team"],
-                            "session_number": 0,
-                        }
-                    )
-        elif self.file_type == FILE_TYPES[1]:
-            LIFT_SHEETNAMES = self.sheetnames
-            df = self.extract(*LIFT_SHEETNAMES)
-            for _, rows in df.iterrows():
-                name = rows["Unnamed: 1"]
-                if (
-                    not isinstance(name, datetime.datetime)
-                    and isinstance(name, str)
-                    and name != "Name"
-                ):
-                    if not name[0].isnumeric():
-                        athlete = {
-                            "first_name": name_parser(name)["first_name"],
-                            "last_name": name_parser(name)["last_name"],
-                            "yearborn": rows["Unnamed: 2"],
-                        }
-                        athletes.append(athlete)
-                if (
-                    isinstance(rows["Unnamed: 3"], str)
-                    and "Session" in rows["Unnamed: 3"]
-                ):
-                    current_session = rows["Unnamed: 4"]
-                    weight_class = None
-                if (
-                    not isinstance(name, datetime.datetime)
-                    and isinstance(name, str)
-                    and name != "Name"
-                ):
-                    if name[0].isnumeric():
-                        weight_class = rows["Unnamed: 1"]
-                    if not name[0].isnumeric():
-                        if weight_class is None:
-                            raise Exception(
-                                f"No weightclass set for this session: {current_session}"
-                            )
-                        if weight_class.lower() == "69kg":
-                            raise Exception(
-                                "Please change weight class to either '69kgm' or '69kgw' to indicate male and female (respectively)."
-                            )
-                        self._lifts_data.append(
-                            {
-                                "athlete": athlete,
-                                "lottery_number": rows[df.columns[0]],
-                                "snatch_first": determine_lift(
-                                    rows["Unnamed: 5"]
-                                ),
-                                "snatch_first_weight": parse_lift_number(
-                                    rows["Unnamed: 5"]
-                                ),
-                                "snatch_second": determine_lift(
-                                    rows["Unnamed: 6"]
-                                ),
-                                "snatch_second_weight": parse_lift_number(
-                                    rows["Unnamed: 6"]
-                                ),
-                                "snatch_third": determine_lift(
-                                    rows["Unnamed: 7"]
-                                ),
-                                "snatch_third_weight": parse_lift_number(
-                                    rows["Unnamed: 7"]
-                                ),
-                                "cnj_first": determine_lift(
-                                    rows["Unnamed: 8"]
-                                ),
-                                "cnj_first_weight": parse_lift_number(
-                                    rows["Unnamed: 8"]
-                                ),
-                                "cnj_second": determine_lift(
-                                    rows["Unnamed: 9"]
-                                ),
-                                "cnj_second_weight": parse_lift_number(
-                                    rows["Unnamed: 9"]
-                                ),
-                                "cnj_third": determine_lift(
-                                    rows["Unnamed: 10"]
-                                ),
-                                "cnj_third_weight": parse_lift_number(
-                                    rows["Unnamed: 10"]
-                                ),
-                                "bodyweight": float(rows["Unnamed: 4"]),
-                                "weight_category": parse_weight_category_excelmacro(
-                                    weight_class
-                                ),
-                                "team": rows["Unnamed: 3"],
-                                "session_number": current_session,
-                            }
-                        )
-
-        return {"athletes": athletes, "lifts": self._lifts_data}
+                else:
+                    self._results_data = self._parse_results()
+                    self._store()
+            self._results_key = key
+        return self._results_data
+
+    def _parse_results(self) -> dict[str, tuple]:
+        """Parse to obtain athlete and lift data.
+
+        Returns:
+            dict[str, tuple]: Athlete and lift records.
+        """
+        parser = PARSERS.get(self.file_type)
+        if parser is None:
+            athletes = []
+            lifts = [LiftRecord.from_dict(lift) for lift in self._lifts_data]
+        else:
+            athletes, lifts = parser.results(self)
+
+        return {"athletes": tuple(athletes), "lifts": tuple(lifts)}
+
+    def iter_lifts(self) -> Iterator[LiftRecord]:
+        """Stream lifts from the file without loading whole sheets.
+
+        Each lift is parsed from `iter_rows` as soon as its row is read.
+        Unlike `lifts`, excel macro validation stops at the first athlete
+        without a valid weight class.
+
+        Raises:
+            Exception: Athlete without a weight class or with an ambiguous
+                weight class.
+
+        Yields:
+            LiftRecord: Lifts in file order.
+        """
+        parser = PARSERS.get(self.file_type)
+        if parser is not None:
+            yield from parser.iter_lifts(self)
 
     @property
     def athletes(self) -> list[dict]:
@@ -270,7 +591,7 @@ class CompetitionFile(BaseCompetitionFile):
         Returns:
             list[dict]: Athelte data.
         """
-        return self._results()["athletes"]
+        return [athlete.to_dict() for athlete in self._results()["athletes"]]
 
     @property
     def lifts(self) -> list[dict]:
@@ -279,88 +600,97 @@ class CompetitionFile(BaseCompetitionFile):
         Returns:
             list[dict]: Lift data.
         """
-        return self._results()["lifts"]
+        return [lift.to_dict() for lift in self._results()["lifts"]]
 
     @lifts.setter
     def lifts(
         self, value: dict[str, dict[str | str | int] | str | int]
     ) -> None:
+        self._lifts_data, self._lift_diagnostics = self._map_lifts(value)
+        self._results_data = None
+
+    def _map_lifts(
+        self, value: dict[str, dict[str | str | int] | str | int]
+    ) -> tuple[list[dict], pd.DataFrame]:
+        """Convert rows using a manual mapping of lift fields to columns.
+
+        Rows without an integer lottery number are skipped. A row with a
+        cell that cannot be converted is left out of the lifts.
+
+        Args:
+            value (dict): Column for each lift field, with the athlete's
+                fields under "athlete".
+
+        Returns:
+            tuple[list[dict], pd.DataFrame]: Lifts, and a diagnostics row
+                for each converted cell, see `DIAGNOSTIC_COLUMNS`.
+        """
         df = self.extract(*self.sheetnames)
-        self._lift_data = []
-        for _, rows in df.iterrows():
-            lift = {}
-            athlete = {}
-            first_name = rows[value["athlete"]["first_name"]]
-            last_name = rows[value["athlete"]["last_name"]]
-            yearborn = rows[value["athlete"]["yearborn"]]
-            lottery_number = rows[value["lottery_number"]]
-            snatch_first = rows[value["snatch_first"]]
-            snatch_second = rows[value["snatch_second"]]
-            snatch_third = rows[value["snatch_third"]]
-            cnj_first = rows[value["cnj_first"]]
-            cnj_second = rows[value["cnj_second"]]
-            cnj_third = rows[value["cnj_third"]]
-            bodyweight = rows[value["bodyweight"]]
+        mapping = [
+            (field, value["athlete"][field])
+            for field in ("first_name", "last_name", "yearborn")
+        ] + [
+            (field, value[field])
+            for field in (
+                "lottery_number",
+                *ATTEMPT_FIELDS,
+                "bodyweight",
+                "team",
+            )
+        ]
+        lifts = []
+        diagnostics = []
+        for row_number, rows in df.iterrows():
+            if not isinstance(rows[value["lottery_number"]], int):
+                continue
+            lift = {"athlete": {}}
+            failed = False
+            for field, column in mapping:
+                cell = rows[column]
+                error = ""
+                try:
+                    converted = _convert_mapped(field, cell)
+                except Exception as e:
+                    converted = {}
+                    error = f"{type(e).__name__}: {e}"
+                    failed = True
+                diagnostics.append(
+                    [
+                        row_number,
+                        field,
+                        str(column),
+                        str(cell),
+                        type(cell).__name__,
+                        ", ".join(str(v) for v in converted.values()),
+                        error,
+                    ]
+                )
+                if field in value["athlete"]:
+                    lift["athlete"].update(converted)
+                else:
+                    lift.update(converted)
             # "weight_category": parse_weight_category_excelmacro(weight_class)
-            team = rows[value["team"]]
             # "session_number": current_session
-            session_number = 0
-
-            if isinstance(lottery_number, int):
-                st.write(f"first_name | {first_name} | {type(first_name)}")
-                athlete["first_name"] = first_name
-                st.write(f"last_name | {last_name} | {type(last_name)}")
-                athlete["last_name"] = last_name
-                st.write(f"yearborn | {yearborn} | {type(yearborn)}")
-                athlete["yearborn"] = yearborn
-                lift["athlete"] = athlete
-
-                st.write(
-                    f"lottery_number | {lottery_number} | {type(lottery_number)}"
-                )
-                lift["lottery_number"] = lottery_number
+            lift["session_number"] = 0
+            if not failed:
+                lifts.append(lift)
+        return lifts, pd.DataFrame(diagnostics, columns=DIAGNOSTIC_COLUMNS)
 
-                st.write(
-                    f"snatch_first | {snatch_first} | {type(snatch_first)}"
-                )
-                lift["snatch_first"] = determine_lift(snatch_first)
-                lift["snatch_first_weight"] = parse_lift_number(snatch_first)
+    def lift_diagnostics(self, failed_only: bool = False) -> pd.DataFrame:
+        """Provide the conversions made by the last manual lift mapping.
 
-                st.write(
-                    f"snatch_second | {snatch_second} | {type(snatch_second)}"
-                )
-                lift["snatch_second"] = determine_lift(snatch_second)
-                lift["snatch_second_weight"] = parse_lift_number(snatch_second)
+        Args:
+            failed_only (bool): Only the rows with a failed conversion.
 
-                st.write(
-                    f"snatch_third | {snatch_third} | {type(snatch_third)}"
-                )
-                lift["snatch_third"] = determine_lift(snatch_third)
-                lift["snatch_third_weight"] = parse_lift_number(snatch_third)
-
-                st.write(f"cnj_first | {cnj_first} | {type(cnj_first)}")
-                lift["cnj_first"] = determine_lift(cnj_first)
-                lift["cnj_first_weight"] = parse_lift_number(cnj_first)
-
-                st.write(f"cnj_second | {cnj_second} | {type(cnj_second)}")
-                lift["cnj_second"] = determine_lift(cnj_second)
-                lift["cnj_second_weight"] = parse_lift_number(cnj_second)
-
-                st.write(f"cnj_third | {cnj_third} | {type(cnj_third)}")
-                lift["cnj_third"] = determine_lift(cnj_third)
-                lift["cnj_third_weight"] = parse_lift_number(cnj_third)
-
-                st.write(f"bodyweight | {bodyweight} | {type(bodyweight)}")
-                lift["bodyweight"] = float(bodyweight)
-                # "weight_category": parse_weight_category_excelmacro(weight_class),
-                st.write(f"team | {team} | {type(team)}")
-                lift["team"] = team
-                # "session_number": current_session,
-                st.write(
-                    f"session_number | {session_number} | {type(session_number)}"
-                )
-                lift["session_number"] = session_number
-                self._lifts_data.append(lift)
+        Returns:
+            pd.DataFrame: One row per converted cell, see
+                `DIAGNOSTIC_COLUMNS`.
+        """
+        diagnostics = self._lift_diagnostics
+        if failed_only:
+            failed = diagnostics.loc[diagnostics["error"] != "", "row"]
+            diagnostics = diagnostics[diagnostics["row"].isin(failed)]
+        return diagnostics.reset_index(drop=True)
 
     def __repr__(self) -> None:
         return str(self.competition()["name"])
@@ -1,20 +1,29 @@
 """Main.py."""
 import datetime
 import os
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
-from lifter_api import LifterAPI
-from requests.exceptions import HTTPError
+import pandas as pd
 import streamlit as st
 
 from utils.types import CompetitionType, AthleteType
+from athletes import AthleteIndex
+from client import PooledLifterAPI
+from competitions import CompetitionCatalogue
 from file import CompetitionFile
+from upload import upload_lifts
+from utils.cache import ParseCache, file_digest
+from utils.ledger import UploadLedger
+from utils.timing import TIMINGS, profiling
 
 BASE_DIR = Path(__file__).parent.parent.parent
 
 data_path = BASE_DIR / "data"
 
+PARSE_CACHE = ParseCache(BASE_DIR / ".cache")
+
 
 def list_data_directories(data_dir: Path = data_path) -> list[Path]:
     """Provide a list of directories in side /data."""
@@ -29,45 +38,42 @@ def list_data_files(data_dir: Path = data_path) -> list[Path]:
 
 
 def check_competition_exists(
-    api: LifterAPI, competition: CompetitionType
+    competitions: CompetitionCatalogue, competition: CompetitionType
 ) -> list[str]:
     """Search competition by date to ensure no duplicate competitions."""
-    competitions = []
-    next = "page=1"
-    while next is not None:
-        new_page = next.split("page=")[-1]
-        response = api.competitions(page=new_page)
-        competitions.extend(response["results"])
-        next = response["next"]
     return [
         c["reference_id"]
-        for c in competitions
-        if competition["date_start"] == c["date_start"]
+        for c in competitions.find(date_start=competition["date_start"])
     ]
 
 
 def check_and_create_competition(
-    api: LifterAPI,
+    competitions: CompetitionCatalogue,
     competition: dict[str, str],
     override: Optional[bool] = False,
 ) -> dict[str, str] | None:
     """Create competition."""
-    if override is False and check_competition_exists(competition):
+    if override is False and check_competition_exists(
+        competitions, competition
+    ):
         return None
-    api.create_competition(**competition)
+    competitions.create_competition(**competition)
     return competition
 
 
-def check_athlete_exists(api: LifterAPI, athlete: AthleteType) -> str | None:
+def check_athlete_exists(
+    athletes: AthleteIndex, athlete: AthleteType
+) -> str | None:
     """Check if an athlete exists."""
-    result = api.find_athlete(
-        f"{athlete['first_name']} {athlete['last_name']}"
-    )
-    if result["count"] == 1:
-        return result["results"][0]["reference_id"]
-    # handling multiple athletes returned on find
-    elif result["count"] > 1:
-        options = {idx: r for idx, r in enumerate(result["results"])}
+    result = athletes.find(athlete)
+    if len(result) == 1:
+        return result[0]
+    # handling multiple athletes matched
+    elif len(result) > 1:
+        options = {
+            idx: {"reference_id": r, **athletes.athletes[r]}
+            for idx, r in enumerate(result)
+        }
         print(options)
         while True:
             i = int(input("Enter number for athlete: "))
@@ -75,6 +81,125 @@ def check_athlete_exists(api: LifterAPI, athlete: AthleteType) -> str | None:
                 return options[i]["reference_id"]
 
 
+@st.cache_resource
+def open_competition_file(file_hash: str, _file) -> CompetitionFile:
+    """Open a file once per file hash, for the cached helpers below."""
+    return CompetitionFile(_file, cache=PARSE_CACHE)
+
+
+@st.cache_data
+def read_sheetnames(file_hash: str, _file) -> list[str]:
+    """Provide the sheetnames of a file."""
+    return open_competition_file(file_hash, _file).sheetnames
+
+
+@st.cache_data
+def extract_sheets(
+    file_hash: str, _file, sheets: tuple[str, ...]
+) -> pd.DataFrame:
+    """Provide the selected sheets of a file."""
+    return open_competition_file(file_hash, _file).extract(*sheets)
+
+
+@st.cache_data
+def list_candidate_items(
+    file_hash: str, _file, sheets: tuple[str, ...]
+) -> list:
+    """Provide the column names and cells of the selected sheets."""
+    df = extract_sheets(file_hash, _file, sheets)
+    return list(df.columns) + df.to_numpy(dtype=object).ravel().tolist()
+
+
+@st.cache_data
+def parse_competition_file(file_hash: str, _file) -> dict[str, list | dict]:
+    """Provide the competition, athletes and lifts parsed from a file."""
+    comp = open_competition_file(file_hash, _file)
+    return {
+        "competition": comp.competition,
+        "athletes": comp.athletes,
+        "lifts": comp.lifts,
+    }
+
+
+def _freeze(mapping: dict) -> tuple:
+    """Make a mapping of widget choices hashable for the cache."""
+    return tuple(
+        (key, _freeze(value) if isinstance(value, dict) else value)
+        for key, value in mapping.items()
+    )
+
+
+def _thaw(frozen: tuple) -> dict:
+    """Turn a frozen mapping back into a dictionary, see `_freeze`."""
+    return {
+        key: _thaw(value) if isinstance(value, tuple) else value
+        for key, value in frozen
+    }
+
+
+@st.cache_data
+def map_competition(file_hash: str, _file, competition: tuple) -> dict:
+    """Provide the competition from manually chosen items."""
+    comp = CompetitionFile(_file, cache=PARSE_CACHE)
+    comp.competition = _thaw(competition)
+    return comp.competition
+
+
+@st.cache_data
+def map_lifts(file_hash: str, _file, mapping: tuple) -> dict:
+    """Provide the lifts, athletes and diagnostics of a manual mapping."""
+    comp = CompetitionFile(_file, cache=PARSE_CACHE)
+    comp.lifts = _thaw(mapping)
+    return {
+        "lifts": comp.lifts,
+        "athletes": comp.athletes,
+        "diagnostics": comp.lift_diagnostics(),
+        "failed": comp.lift_diagnostics(failed_only=True),
+    }
+
+
+def show_timings() -> None:
+    """Show how long each stage has taken, see `utils.timing`."""
+    with st.expander("Timings"):
+        summary = TIMINGS.summary()
+        if not summary:
+            st.write("Nothing timed yet.")
+            return
+        st.dataframe(pd.DataFrame.from_dict(summary, orient="index"))
+        if profiling():
+            for stage, listing in TIMINGS.profiles().items():
+                st.text(stage)
+                st.code(listing)
+        st.download_button(
+            "Download timings", TIMINGS.to_json(), "timings.json"
+        )
+        if st.button("Reset timings"):
+            TIMINGS.reset()
+
+
+@st.cache_resource
+def connect(local: bool) -> PooledLifterAPI:
+    """Provide an API client, kept between reruns."""
+    if local:
+        return PooledLifterAPI(auth_token=os.getenv("API_TOKEN"))
+    return PooledLifterAPI(auth_token=os.getenv("LIVE_API_TOKEN"))
+
+
+@st.cache_resource
+def load_competitions(local: bool) -> CompetitionCatalogue:
+    """Provide the competition catalogue, refreshed when older than its TTL."""
+    return CompetitionCatalogue(connect(local))
+
+
+@st.cache_resource
+def load_athletes(local: bool) -> AthleteIndex:
+    """Provide the athlete index, loaded from disk once."""
+    target = "local" if local else "live"
+    return AthleteIndex(
+        connect(local), BASE_DIR / ".cache" / f"athletes-{target}.json"
+    )
+
+
 def main():
     """Run main."""
     st.header("Assessing Competition File")
@@ -106,27 +231,27 @@ def main():
                 idx = i
                 break
         selected_file = st.selectbox("Select File:", files, index=idx)
+    if selected_file is None:
+        st.stop()
 
-    comp = CompetitionFile(
-        selected_file,
-    )
-    sheet = st.multiselect(
-        "Select Sheet(s): ", comp.sheetnames, default=comp.sheetnames
-    )
+    # parsing is cached by file hash, so reruns do not re-read the file
+    file_hash = file_digest(selected_file)
+    parsed = parse_competition_file(file_hash, selected_file)
+    sheetnames = read_sheetnames(file_hash, selected_file)
+    sheet = st.multiselect("Select Sheet(s): ", sheetnames, default=sheetnames)
 
-    df = comp.extract(*sheet)
+    df = extract_sheets(file_hash, selected_file, tuple(sheet))
     with st.sidebar:
         st.dataframe(df)
 
-    items = list(df.columns) + [
-        item for _, row in df.iterrows() for item in row
-    ]
+    items = list_candidate_items(file_hash, selected_file, tuple(sheet))
 
     # def contains_number(string: str) -> bool:
     #     return any([char.isdigit() for char in string])
 
     st.subheader("Competition Data")
-    if not any(list(comp.competition.values())):
+    competition = parsed["competition"]
+    if not any(list(competition.values())):
         competition_input = {}
         competition_input["name"] = st.selectbox(
             "name",
@@ -150,13 +275,16 @@ def main():
             "date_end",
             sorted(dates, reverse=True),
         )
-        comp.competition = competition_input
+        competition = map_competition(
+            file_hash, selected_file, _freeze(competition_input)
+        )
 
-    st.write(comp.competition)
+    st.write(competition)
     st.dataframe(df)
 
     st.subheader("Lift Data")
-    if len(comp.lifts) == 0:
+    lifts, athletes = parsed["lifts"], parsed["athletes"]
+    if len(lifts) == 0:
         lifts_input = {}
         lifts_input["athlete"] = {}
 
@@ -208,26 +336,33 @@ def main():
         lifts_input["session_number"] = st.selectbox(
             "session_number", df.columns, index=3
         )
-    with st.empty():
-        comp.lifts = lifts_input
-        st.success("Success in parsing lifts")
-
-    st.dataframe(comp.lifts)
-    st.dataframe(comp.athletes)
+        mapped = map_lifts(file_hash, selected_file, _freeze(lifts_input))
+        lifts, athletes = mapped["lifts"], mapped["athletes"]
+        failed_only = st.checkbox("Only show rows that failed", value=True)
+        diagnostics = mapped["failed" if failed_only else "diagnostics"]
+        if (diagnostics["error"] != "").any():
+            st.warning("Some rows could not be converted.")
+        else:
+            st.success("Success in parsing lifts")
+        st.dataframe(diagnostics)
+
+    st.dataframe(lifts)
+    st.dataframe(athletes)
 
     st.subheader("Uploading to Database")
     local = st.radio("Run locally?", [True, False])
     if local:
         os.environ["LOCAL_DEVELOPMENT"] = "1"
-        api = LifterAPI(auth_token=os.getenv("API_TOKEN"))
+        api = connect(local)
         st.success("Running locally.")
     else:
         os.environ["LOCAL_DEVELOPMENT"] = "0"
-        api = LifterAPI(auth_token=os.getenv("LIVE_API_TOKEN"))
+        api = connect(local)
         st.warning("WARNING: Running on LIVE!")
     os.environ["LOCAL_DEVELOPMENT"] = "1"
 
-    competition_exists = check_competition_exists(api, comp.competition)
+    competitions = load_competitions(local)
+    competition_exists = check_competition_exists(competitions, competition)
     competition_id = None
     if len(competition_exists) > 0:
         competition_id = st.selectbox(
@@ -236,7 +371,9 @@ def main():
         st.write(
             {
                 k: v
-                for k, v in api.get_competition(competition_id).items()
+                for k, v in competitions.competitions.get(
+                    competition_id, {}
+                ).items()
                 if k in ("reference_id", "name", "date_start")
             }
         )
@@ -244,48 +381,59 @@ def main():
         st.write("No Competitions found with same date.")
         if st.button("Create Competition"):
             st.write("Created competition:")
-            response = api.create_competition(**comp.competition)
+            response = competitions.create_competition(**competition)
             st.write(response)
             competition_id = response["reference_id"]
 
     if competition_id is not None:
         if st.button("Upload Results"):
-            lifts = comp.lifts
             upload_progress = st.progress(0)
-            for i, lift in enumerate(lifts):
-                athlete = lift["athlete"]
-                with st.spinner(
-                    f"Adding {athlete['first_name']} {athlete['last_name'].upper()} ..."
-                ):
-                    athlete_id = check_athlete_exists(api, athlete)
-                    if athlete_id is None:
-                        athlete_id = api.create_athlete(**athlete)[
-                            "reference_id"
-                        ]
+            target = "local" if local else "live"
+            athlete_index = load_athletes(local)
+            ledger = UploadLedger(
+                BASE_DIR / ".cache" / f"uploads-{target}.sqlite"
+            )
+            try:
+                with st.spinner("Updating athlete index ..."):
+                    athlete_index.refresh()
+                results = upload_lifts(
+                    api,
+                    lifts,
+                    competition_id,
+                    partial(check_athlete_exists, athlete_index),
+                    create_athlete=athlete_index.create_athlete,
+                    ledger=ledger,
+                    file_hash=file_hash,
+                    athlete_exists=lambda athlete_id: athlete_id
+                    in athlete_index.athletes,
+                )
+                for i, result in enumerate(results, start=1):
+                    athlete = result.athlete
+                    first_name = athlete["first_name"]
+                    last_name = athlete["last_name"].upper()
+                    name = f"{first_name} {last_name}"
+                    if result.athlete_created:
                         st.write(
-                            f"{athlete['first_name']} {athlete['last_name'].upper()} created - '{athlete_id}'"
-                        )
-                    lift.pop("athlete")
-                    try:
-                        api.create_lift(
-                            athlete_id=athlete_id,
-                            competition_id=competition_id,
-                            **lift,
+                            f"{name} created - '{result.athlete_id}'"
                         )
+                    if result.recorded:
+                        st.write(f"{name} lift already uploaded.")
+                    elif result.lift_id is None:
                         st.write(
-                            f"{athlete['first_name']} {athlete['last_name'].upper()} lift added."
+                            f"{name} lift already in the competition."
                         )
-                    except HTTPError as e:
-                        check_lifts = api.lifts(competition_id=competition_id)
-                        if athlete_id not in [
-                            lift["athlete"] for lift in check_lifts
-                        ]:
-                            raise Exception(e)
-                upload_progress.progress(i / (len(lifts) - 1))
+                    else:
+                        st.write(f"{name} lift added.")
+                    upload_progress.progress(i / len(lifts))
+                athlete_index.save()
+            finally:
+                ledger.close()
 
             # celebrate!
             st.balloons()
 
+    show_timings()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,482 @@
+"""Results file formats.
+
+A format is a `Parser` subclass added with `register_parser`:
+
+>>> @register_parser
+... class MeetManagerParser(Parser):
+...     name = "meetmanager"
+...     sheets = ("Results",)
+...
+...     def detect(self, comp):
+...         return "Results" in comp.sheetnames
+...
+...     def competition(self, comp):
+...         ...
+...
+...     def results(self, comp):
+...         ...
+"""
+
+import datetime
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+from utils.helpers import (
+    convert_date,
+    parse_lift_number,
+    parse_lift_numbers,
+    determine_lift,
+    determine_lifts,
+    parse_weight_category,
+    parse_weight_categories,
+    name_parser,
+    parse_names,
+    parse_weight_category_excelmacro,
+    parse_weight_categories_excelmacro,
+)
+from utils.types import AthleteRecord, CompetitionType, LiftRecord
+
+if TYPE_CHECKING:
+    from file import CompetitionFile
+
+# rows read from the first sheet when detecting the file type
+DETECT_ROWS = 10
+
+OWLCMS_ATTEMPT_COLUMNS = {
+    "snatch_first": "Snatch",
+    "snatch_second": "Unnamed: 9",
+    "snatch_third": "Unnamed: 10",
+    "cnj_first": "Clean&Jerk",
+    "cnj_second": "Unnamed: 14",
+    "cnj_third": "Unnamed: 15",
+}
+
+EXCELMACRO_ATTEMPT_COLUMNS = {
+    "snatch_first": "Unnamed: 5",
+    "snatch_second": "Unnamed: 6",
+    "snatch_third": "Unnamed: 7",
+    "cnj_first": "Unnamed: 8",
+    "cnj_second": "Unnamed: 9",
+    "cnj_third": "Unnamed: 10",
+}
+
+
+def _attempts(df: pd.DataFrame, columns: dict[str, str]) -> dict[str, list]:
+    """Convert attempt columns to lift statuses and weights.
+
+    Args:
+        df (pd.DataFrame): Rows of lifts.
+        columns (dict[str, str]): Attempt name to column name.
+
+    Returns:
+        dict[str, list]: Status and weight columns for each attempt.
+    """
+    weights = df[list(columns.values())].to_numpy(dtype=float)
+    statuses = determine_lifts(weights)
+    weights = parse_lift_numbers(weights)
+    attempts = {}
+    for i, name in enumerate(columns):
+        attempts[name] = statuses[:, i].tolist()
+        attempts[f"{name}_weight"] = weights[:, i].tolist()
+    return attempts
+
+
+def _text(column: pd.Series) -> pd.Series:
+    """Keep the string cells of a column, blanking everything else.
+
+    Args:
+        column (pd.Series): Mixed type column.
+
+    Returns:
+        pd.Series: Column of strings.
+    """
+    return column.where(column.map(type) == str, "")
+
+
+def _row_attempts(row: dict[str, Any], columns: dict[str, str]) -> dict:
+    """Convert a row's attempts to lift statuses and weights.
+
+    Args:
+        row (dict[str, Any]): Row of a lift.
+        columns (dict[str, str]): Attempt name to column name.
+
+    Returns:
+        dict: Status and weight for each attempt.
+    """
+    attempts = {}
+    for name, column in columns.items():
+        attempts[name] = determine_lift(row[column])
+        attempts[f"{name}_weight"] = parse_lift_number(row[column])
+    return attempts
+
+
+def _lift_records(columns: dict[str, list]) -> list[LiftRecord]:
+    """Turn equal length columns into a list of lifts.
+
+    Args:
+        columns (dict[str, list]): Lift field to values.
+
+    Returns:
+        list[LiftRecord]: A lift for each row.
+    """
+    return [
+        LiftRecord(**dict(zip(columns, values)))
+        for values in zip(*columns.values())
+    ]
+
+
+class Parser(ABC):
+    """A results file format.
+
+    Every method is given the `CompetitionFile`, so all of them share its
+    opened workbook and parsed sheets. The lift sheets are read with only
+    the `columns` a format needs, as the `dtype` given rather than
+    inferred.
+    """
+
+    # file type, e.g. "owlcms"
+    name: str = ""
+    # sheets holding the lifts, all sheets if empty
+    sheets: tuple[str, ...] = ()
+    # column labels read from the lift sheets, None for all columns
+    columns: tuple[str, ...] | None = None
+    # dtypes of the lift sheet columns, by label or one for every column;
+    # None to infer them
+    dtype: dict[str, Any] | type | None = None
+
+    @abstractmethod
+    def detect(self, comp: "CompetitionFile") -> bool:
+        """Determine whether a file is in this format.
+
+        Args:
+            comp (CompetitionFile): Opened file.
+
+        Returns:
+            bool: True if the file is in this format.
+        """
+
+    def lift_sheets(self, comp: "CompetitionFile") -> list[str]:
+        """Provide the sheetnames holding the lifts.
+
+        Args:
+            comp (CompetitionFile): Opened file.
+
+        Returns:
+            list[str]: Sheetnames.
+        """
+        return list(self.sheets) or comp.sheetnames
+
+    def extract_lifts(self, comp: "CompetitionFile") -> pd.DataFrame:
+        """Provide the lift sheets, with only the columns needed.
+
+        Args:
+            comp (CompetitionFile): Opened file.
+
+        Returns:
+            pd.DataFrame: Concatenated lift sheets.
+        """
+        return comp.extract(
+            *self.lift_sheets(comp), usecols=self.columns, dtype=self.dtype
+        )
+
+    @abstractmethod
+    def competition(self, comp: "CompetitionFile") -> CompetitionType:
+        """Parse the competition details.
+
+        Args:
+            comp (CompetitionFile): Opened file.
+
+        Returns:
+            CompetitionType: Competition data.
+        """
+
+    @abstractmethod
+    def results(
+        self, comp: "CompetitionFile"
+    ) -> tuple[list[AthleteRecord], list[LiftRecord]]:
+        """Parse the athletes and lifts.
+
+        Args:
+            comp (CompetitionFile): Opened file.
+
+        Returns:
+            tuple[list[AthleteRecord], list[LiftRecord]]: Athletes and
+                lifts.
+        """
+
+    def iter_lifts(self, comp: "CompetitionFile") -> Iterator[LiftRecord]:
+        """Stream lifts, see `CompetitionFile.iter_lifts`.
+
+        Defaults to the parsed lifts.
+
+        Args:
+            comp (CompetitionFile): Opened file.
+
+        Yields:
+            LiftRecord: Lifts in file order.
+        """
+        yield from self.results(comp)[1]
+
+
+# file type to parser, in the order formats are detected
+PARSERS: dict[str, Parser] = {}
+
+
+def register_parser(cls: type[Parser]) -> type[Parser]:
+    """Add a format, replacing any registered under the same name.
+
+    Args:
+        cls (type[Parser]): Parser subclass with a `name`.
+
+    Raises:
+        TypeError: The class does not implement every abstract method.
+
+    Returns:
+        type[Parser]: The class, so this can be used as a decorator.
+    """
+    PARSERS[cls.name] = cls()
+    return cls
+
+
+@register_parser
+class OwlcmsParser(Parser):
+    """owlcms results, with "Men's Results" and "Women's Results" sheets."""
+
+    name = "owlcms"
+    sheets = ("Men's Results", "Women's Results")
+    dtype = {
+        # group rows have the group name in the lot column
+        "Lot": object,
+        "Last Name": object,
+        "First Name": object,
+        "Team": object,
+        "Born": float,
+        "B.W.": float,
+        "Cat.": object,
+        **dict.fromkeys(OWLCMS_ATTEMPT_COLUMNS.values(), float),
+    }
+    columns = tuple(dtype)
+
+    def detect(self, comp: "CompetitionFile") -> bool:
+        """Determine whether the file has owlcms sheets."""
+        return {"Competition", *self.sheets} <= set(comp.sheetnames)
+
+    def competition(self, comp: "CompetitionFile") -> CompetitionType:
+        """Parse the "Competition" sheet."""
+        df = comp.extract("Competition")
+        dates = []
+        for _, item in df["Unnamed: 3"].items():
+            if isinstance(item, str) and "Weigh-in" in item:
+                dates.append(item.split(" ")[2])
+        dates.sort(reverse=True)
+        return {
+            "name": df.columns[1],
+            "location": df.iloc[0][1],
+            "date_start": convert_date(df.iloc[1][1]),
+            "date_end": dates[0],
+        }
+
+    def results(
+        self, comp: "CompetitionFile"
+    ) -> tuple[list[AthleteRecord], list[LiftRecord]]:
+        """Parse owlcms results sheets a column at a time."""
+        df = self.extract_lifts(comp)
+        df = df[df["Lot"].map(type) == int]
+        athletes = [
+            AthleteRecord(first_name, last_name, born)
+            for first_name, last_name, born in zip(
+                df["First Name"].tolist(),
+                df["Last Name"].tolist(),
+                df["Born"].astype(int).tolist(),
+            )
+        ]
+        lifts = _lift_records(
+            {
+                "athlete": athletes,
+                "lottery_number": df["Lot"].tolist(),
+                **_attempts(df, OWLCMS_ATTEMPT_COLUMNS),
+                "bodyweight": df["B.W."].astype(float).tolist(),
+                "weight_category": parse_weight_categories(
+                    df["Cat."]
+                ).tolist(),
+                "team": df["Team"].tolist(),
+                "session_number": [0] * len(df),
+            }
+        )
+        return athletes, lifts
+
+    def iter_lifts(self, comp: "CompetitionFile") -> Iterator[LiftRecord]:
+        """Stream lifts from the results sheets."""
+        for row in comp.iter_rows(*self.sheets):
+            if type(row["Lot"]) is int:
+                yield LiftRecord(
+                    athlete=AthleteRecord(
+                        row["First Name"],
+                        row["Last Name"],
+                        int(row["Born"]),
+                    ),
+                    lottery_number=row["Lot"],
+                    **_row_attempts(row, OWLCMS_ATTEMPT_COLUMNS),
+                    bodyweight=float(row["B.W."]),
+                    weight_category=parse_weight_category(row["Cat."]),
+                    team=row["Team"],
+                    session_number=0,
+                )
+
+
+@register_parser
+class ExcelMacroParser(Parser):
+    """Excel macro results, with a sheet per session.
+
+    Sessions start with a "Session" row and athletes are grouped under
+    weight class rows, e.g. "69kgm".
+    """
+
+    name = "excelmacro"
+    # header, session and weight class rows share the athletes' columns,
+    # so no column has a single type
+    dtype = object
+
+    def detect(self, comp: "CompetitionFile") -> bool:
+        """Determine whether the first sheet has "Session" and "Name"."""
+        head = comp.sheet(comp.sheetnames[0], nrows=DETECT_ROWS)
+        if not {"Unnamed: 1", "Unnamed: 3"} <= set(head.columns):
+            return False
+        has_name = _text(head["Unnamed: 1"]).eq("Name").any()
+        has_session = (
+            _text(head["Unnamed: 3"])
+            .str.contains("Session", regex=False)
+            .any()
+        )
+        return bool(has_name and has_session)
+
+    def competition(self, comp: "CompetitionFile") -> CompetitionType:
+        """Parse the competition from the session headers."""
+        df = self.extract_lifts(comp)
+        dates = [
+            item
+            for _, item in df["Unnamed: 1"].items()
+            if isinstance(item, datetime.datetime)
+        ]
+        dates.sort(reverse=True)
+        return {
+            "name": df.columns[0],
+            "date_end": convert_date(dates[0]),
+            "date_start": convert_date(df.iloc[0][1]),
+            "location": df.iloc[0][8],
+        }
+
+    def results(
+        self, comp: "CompetitionFile"
+    ) -> tuple[list[AthleteRecord], list[LiftRecord]]:
+        """Parse excel macro session sheets a column at a time.
+
+        Session and weight class header rows are forward filled onto the
+        athlete rows beneath them.
+
+        Raises:
+            Exception: Athletes without a weight class or with an ambiguous
+                weight class, listing every offending athlete.
+        """
+        df = self.extract_lifts(comp)
+        name = _text(df["Unnamed: 1"])
+        is_name = name.ne("") & name.ne("Name")
+        is_weight_class = is_name & name.str[0].str.isnumeric().eq(True)
+        is_athlete = is_name & ~is_weight_class
+        is_session = _text(df["Unnamed: 3"]).str.contains(
+            "Session", regex=False
+        )
+
+        session = df["Unnamed: 4"].where(is_session).ffill()[is_athlete]
+        # a new session clears the weight class until the next is set
+        weight_class = pd.Series(None, index=df.index, dtype=object)
+        weight_class[is_session] = ""
+        weight_class[is_weight_class] = name[is_weight_class]
+        weight_class = weight_class.ffill().fillna("")[is_athlete]
+
+        names = name[is_athlete]
+        errors = [
+            f"No weightclass set for this session: {current_session} "
+            f"({athlete_name})"
+            for current_session, athlete_name in zip(
+                session[weight_class.eq("")], names[weight_class.eq("")]
+            )
+        ]
+        errors += [
+            "Please change weight class to either '69kgm' or '69kgw' to "
+            f"indicate male and female (respectively): {athlete_name}"
+            for athlete_name in names[weight_class.str.lower().eq("69kg")]
+        ]
+        if errors:
+            raise Exception("\n".join(errors))
+
+        df = df[is_athlete]
+        parsed_names = parse_names(names)
+        athletes = [
+            AthleteRecord(first_name, last_name, yearborn)
+            for first_name, last_name, yearborn in zip(
+                parsed_names["first_name"].tolist(),
+                parsed_names["last_name"].tolist(),
+                df["Unnamed: 2"].tolist(),
+            )
+        ]
+        lifts = _lift_records(
+            {
+                "athlete": athletes,
+                "lottery_number": df[df.columns[0]].tolist(),
+                **_attempts(df, EXCELMACRO_ATTEMPT_COLUMNS),
+                "bodyweight": df["Unnamed: 4"].astype(float).tolist(),
+                "weight_category": parse_weight_categories_excelmacro(
+                    weight_class
+                ).tolist(),
+                "team": df["Unnamed: 3"].tolist(),
+                "session_number": session.tolist(),
+            }
+        )
+        return athletes, lifts
+
+    def iter_lifts(self, comp: "CompetitionFile") -> Iterator[LiftRecord]:
+        """Stream lifts from the session sheets.
+
+        Unlike `results`, validation stops at the first athlete without a
+        valid weight class.
+        """
+        current_session = None
+        weight_class = None
+        for row in comp.iter_rows(*self.lift_sheets(comp)):
+            name = row["Unnamed: 1"]
+            if isinstance(row["Unnamed: 3"], str) and (
+                "Session" in row["Unnamed: 3"]
+            ):
+                current_session = row["Unnamed: 4"]
+                weight_class = None
+            if not isinstance(name, str) or name in ("", "Name"):
+                continue
+            if name[0].isnumeric():
+                weight_class = name
+                continue
+            if weight_class is None:
+                raise Exception(
+                    "No weightclass set for this session: "
+                    f"{current_session} ({name})"
+                )
+            if weight_class.lower() == "69kg":
+                raise Exception(
+                    "Please change weight class to either '69kgm' or "
+                    "'69kgw' to indicate male and female (respectively): "
+                    f"{name}"
+                )
+            yield LiftRecord(
+                athlete=AthleteRecord(
+                    **name_parser(name), yearborn=row["Unnamed: 2"]
+                ),
+                lottery_number=next(iter(row.values())),
+                **_row_attempts(row, EXCELMACRO_ATTEMPT_COLUMNS),
+                bodyweight=float(row["Unnamed: 4"]),
+                weight_category=parse_weight_category_excelmacro(weight_class),
+                team=row["Unnamed: 3"],
+                session_number=current_session,
+            )
@@ -0,0 +1,408 @@
+"""Competition files from saved AWS Textract responses.
+
+A PDF of results is run through Textract's document analysis (with the
+TABLES feature) and each response is saved as JSON, e.g. by paging
+through `GetDocumentAnalysis` with its NextToken. No AWS calls are made
+here, so saved responses can be reparsed offline.
+
+>>> comp = TextractCompetitionFile(Path("data/2022/results.textract.json"))
+>>> comp.sheetnames
+['Competition', "Men's Results", "Women's Results"]
+"""
+
+import datetime
+import hashlib
+import json
+import math
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import pandas as pd
+
+from file import CompetitionFile, _cell_value, _column_labels
+from utils.cache import ParseCache, file_digest
+from utils.timing import span
+
+INTEGER = re.compile(r"-?\d+")
+DECIMAL = re.compile(r"-?\d*\.\d+")
+TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}( \d{2}:\d{2}:\d{2})?")
+NUMBER = re.compile(r"(\d+)")
+
+
+class Cell(NamedTuple):
+    """CELL block."""
+
+    row: int
+    column: int
+    words: tuple[str, ...]
+
+
+class Table(NamedTuple):
+    """TABLE block."""
+
+    page: int
+    top: float
+    cells: tuple[str, ...]
+
+
+class Line(NamedTuple):
+    """LINE block."""
+
+    page: int
+    top: float
+    bottom: float
+    text: str
+    words: tuple[str, ...]
+
+
+@dataclass(slots=True)
+class BlockIndex:
+    """The blocks tables are built from, by ID and in document order."""
+
+    words: dict[str, str] = field(default_factory=dict)
+    cells: dict[str, Cell] = field(default_factory=dict)
+    tables: dict[str, Table] = field(default_factory=dict)
+    lines: list[Line] = field(default_factory=list)
+
+    def text(self, word_ids: tuple[str, ...]) -> str:
+        """Join words, skipping any not in the responses."""
+        return " ".join(
+            self.words[word] for word in word_ids if word in self.words
+        )
+
+
+def response_paths(path: Path) -> list[Path]:
+    """Provide the saved responses of a document.
+
+    Args:
+        path (Path): JSON response, or a directory of JSON responses named
+            in the order they were returned, e.g. "1.json" to "12.json".
+
+    Returns:
+        list[Path]: Response files, with numbers in names sorted by value.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return sorted(path.glob("*.json"), key=_natural_key)
+    return [path]
+
+
+def _natural_key(path: Path) -> list:
+    """Sort key placing "2.json" before "10.json"."""
+    return [
+        int(part) if part.isdigit() else part
+        for part in NUMBER.split(path.name)
+    ]
+
+
+def _child_ids(block: dict) -> tuple[str, ...]:
+    """Provide the IDs of a block's children."""
+    return tuple(
+        child
+        for relationship in block.get("Relationships", ())
+        if relationship["Type"] == "CHILD"
+        for child in relationship["Ids"]
+    )
+
+
+def read_blocks(paths: list[Path]) -> BlockIndex:
+    """Index the blocks tables are built from by ID.
+
+    Responses are read one file at a time, keeping only the fields used
+    from WORD, CELL, TABLE and LINE blocks. Relationships may point to
+    blocks in a later response, so the index covers every file.
+
+    Args:
+        paths (list[Path]): Response files, in order.
+
+    Returns:
+        BlockIndex: Blocks by ID.
+    """
+    index = BlockIndex()
+    for path in paths:
+        with open(path) as f:
+            response = json.load(f)
+        for block in response["Blocks"]:
+            block_type = block["BlockType"]
+            if block_type == "WORD":
+                index.words[block["Id"]] = block["Text"]
+            elif block_type == "CELL":
+                index.cells[block["Id"]] = Cell(
+                    block["RowIndex"], block["ColumnIndex"], _child_ids(block)
+                )
+            elif block_type in ("TABLE", "LINE"):
+                box = block.get("Geometry", {}).get("BoundingBox", {})
+                top = box.get("Top", 0.0)
+                page = block.get("Page", 1)
+                if block_type == "TABLE":
+                    index.tables[block["Id"]] = Table(
+                        page, top, _child_ids(block)
+                    )
+                else:
+                    index.lines.append(
+                        Line(
+                            page,
+                            top,
+                            top + box.get("Height", 0.0),
+                            block.get("Text", ""),
+                            _child_ids(block),
+                        )
+                    )
+    return index
+
+
+def _table_grid(table: Table, index: BlockIndex) -> list[list[str]]:
+    """Lay a table's cells out as rows of text.
+
+    Args:
+        table (Table): Table to lay out.
+        index (BlockIndex): Blocks, see `read_blocks`.
+
+    Returns:
+        list[list[str]]: Rows of cell text, "" for empty cells.
+    """
+    cells = [index.cells[cell] for cell in table.cells if cell in index.cells]
+    if not cells:
+        return []
+    rows = max(cell.row for cell in cells)
+    columns = max(cell.column for cell in cells)
+    grid = [[""] * columns for _ in range(rows)]
+    for cell in cells:
+        grid[cell.row - 1][cell.column - 1] = index.text(cell.words)
+    return grid
+
+
+def _titles(index: BlockIndex) -> dict[str, str]:
+    """Find the line of text above each table on its page.
+
+    Lines made only of words inside tables are not titles.
+
+    Args:
+        index (BlockIndex): Blocks, see `read_blocks`.
+
+    Returns:
+        dict[str, str]: Table ID to title, for tables with one.
+    """
+    in_tables = set()
+    for table in index.tables.values():
+        for cell in table.cells:
+            if cell in index.cells:
+                in_tables.update(index.cells[cell].words)
+    lines = {}
+    for line in index.lines:
+        if not in_tables.issuperset(line.words):
+            lines.setdefault(line.page, []).append(line)
+    titles = {}
+    for table_id, table in index.tables.items():
+        above = [
+            line
+            for line in lines.get(table.page, ())
+            if line.bottom <= table.top
+        ]
+        if above:
+            title = max(above, key=lambda line: line.top)
+            titles[table_id] = title.text or index.text(title.words)
+    return titles
+
+
+def rebuild_tables(index: BlockIndex) -> dict[str, list[list[str]]]:
+    """Rebuild the tables of a document, named by their titles.
+
+    A table without a title, or with the same title as the one before it,
+    continues that table, as results tables broken across pages do; its
+    first row is dropped if it repeats the header. Other tables without a
+    title are named "Table n".
+
+    Args:
+        index (BlockIndex): Blocks, see `read_blocks`.
+
+    Returns:
+        dict[str, list[list[str]]]: Title to rows of cell text, with the
+            header first.
+    """
+    titles = _titles(index)
+    tables = {}
+    previous = None
+    for table_id, table in index.tables.items():
+        grid = _table_grid(table, index)
+        if not grid:
+            continue
+        title = titles.get(table_id)
+        if (
+            previous is not None
+            and title in (None, previous)
+            and len(grid[0]) == len(tables[previous][0])
+        ):
+            if grid[0] == tables[previous][0]:
+                grid = grid[1:]
+            tables[previous].extend(grid)
+            continue
+        if title is None or title in tables:
+            title = f"Table {len(tables) + 1}"
+        tables[title] = grid
+        previous = title
+    return tables
+
+
+def _cell(text: str) -> Any:
+    """Convert cell text as `pd.read_excel` would convert the cell.
+
+    Args:
+        text (str): Cell text.
+
+    Returns:
+        Any: NaN when empty, a number, a datetime for ISO dates, or text.
+    """
+    if text == "":
+        return math.nan
+    if INTEGER.fullmatch(text):
+        return int(text)
+    if DECIMAL.fullmatch(text):
+        return _cell_value(float(text))
+    if TIMESTAMP.fullmatch(text):
+        return datetime.datetime.fromisoformat(text)
+    return text
+
+
+def table_frame(grid: list[list[str]]) -> pd.DataFrame:
+    """Turn a table into a dataframe labelled like an Excel sheet.
+
+    Args:
+        grid (list[list[str]]): Rows of cell text, with the header first.
+
+    Returns:
+        pd.DataFrame: Object columns of converted cells.
+    """
+    header = [_cell(text) if text else None for text in grid[0]]
+    labels = _column_labels(tuple(header), len(header))
+    rows = [[_cell(text) for text in row] for row in grid[1:]]
+    return pd.DataFrame(rows, columns=labels, dtype=object)
+
+
+class TextractCompetitionFile(CompetitionFile):
+    """Competition data from the tables Textract found in a PDF.
+
+    Each table is read as a sheet named after the line of text above it,
+    see `rebuild_tables`, and parsed by the registered parsers as an Excel
+    file would be. Tables are rebuilt once and kept until the responses
+    change.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        file_type: str = "",
+        cache: ParseCache | None = None,
+    ) -> None:
+        super().__init__(file_path, file_type, cache)
+        self._tables = None
+        self._tables_key = None
+
+    @property
+    def file_key(self) -> tuple:
+        """Identify the current version of the responses.
+
+        Returns:
+            tuple: Path, modification time and size of each response.
+        """
+        return tuple(
+            (str(path), stat.st_mtime_ns, stat.st_size)
+            for path, stat in (
+                (path, os.stat(path))
+                for path in response_paths(self.file_path)
+            )
+        )
+
+    def digest(self) -> str:
+        """Hash the contents of the responses.
+
+        Returns:
+            str: SHA-256 hex digest.
+        """
+        digest = hashlib.sha256()
+        for path in response_paths(self.file_path):
+            digest.update(file_digest(path).encode())
+        return digest.hexdigest()
+
+    def refresh(self) -> None:
+        """Forget the tables and parsed results so both are read again."""
+        super().refresh()
+        self._tables_key = None
+
+    @property
+    def tables(self) -> dict[str, pd.DataFrame]:
+        """Provide the tables, rebuilding them if the responses changed.
+
+        Returns:
+            dict[str, pd.DataFrame]: Title to object columns of cells.
+        """
+        key = self.file_key
+        if self._tables is None or key != self._tables_key:
+            with span("textract.tables"):
+                blocks = read_blocks(response_paths(self.file_path))
+                self._tables = {
+                    title: table_frame(grid)
+                    for title, grid in rebuild_tables(blocks).items()
+                }
+            self._tables_key = key
+        return self._tables
+
+    @property
+    @span("file.sheetnames")
+    def sheetnames(self) -> list[str]:
+        """Provide the table titles.
+
+        Returns:
+            list[str]: Table titles, in document order.
+        """
+        return list(self.tables)
+
+    def sheet(
+        self,
+        sheetname: str,
+        usecols: tuple[str, ...] | None = None,
+        dtype: dict[str, Any] | type | None = None,
+        nrows: int | None = None,
+    ) -> pd.DataFrame:
+        """Provide a table as a sheet, see `CompetitionFile.sheet`.
+
+        Args:
+            sheetname (str): Table title.
+            usecols (tuple[str, ...] | None): Only the columns with these
+                labels.
+            dtype (dict[str, Any] | type | None): Column label to dtype, or
+                one dtype for every column, instead of inferring them.
+            nrows (int | None): Only this many rows below the header.
+
+        Returns:
+            pd.DataFrame: Pandas dataframe of the table.
+        """
+        df = self.tables[sheetname]
+        if usecols is not None:
+            df = df[[column for column in df.columns if column in usecols]]
+        if nrows is not None:
+            df = df.head(nrows)
+        if dtype is None:
+            return df.infer_objects()
+        if isinstance(dtype, dict):
+            dtype = {k: v for k, v in dtype.items() if k in df.columns}
+        return df.astype(dtype)
+
+    def prefetch(self, *args, **kwargs) -> None:
+        """Do nothing, as every table is rebuilt at once."""
+
+    def iter_rows(self, *args) -> Iterator[dict[str, Any]]:
+        """Provide the rows of the given tables, see `iter_rows`.
+
+        Args:
+            *args: Table titles as serperate arguments.
+
+        Yields:
+            dict[str, Any]: Column label to value for each row.
+        """
+        for arg in args:
+            yield from self.tables[arg].to_dict("records")
@@ -0,0 +1,256 @@
+"""Upload parsed lifts to the lifter-api."""
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TypeVar
+
+import requests
+from lifter_api import LifterAPI
+
+from utils.ledger import UploadLedger
+from utils.types import AthleteType, LiftType
+
+# requests in flight at once
+WORKERS = 8
+RETRIES = 3
+# seconds, doubled after each retry
+BACKOFF = 0.5
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class UploadResult:
+    """Outcome of uploading one lift."""
+
+    athlete: AthleteType
+    athlete_id: str
+    athlete_created: bool
+    # None when the lift was already in the competition
+    lift_id: str | None
+    # already uploaded, according to the ledger
+    recorded: bool = False
+
+
+def retry(
+    func: Callable[..., T],
+    *args,
+    retries: int = RETRIES,
+    backoff: float = BACKOFF,
+    recover: Callable[[], T | None] | None = None,
+    **kwargs,
+) -> T:
+    """Call a function, retrying connection errors and server errors.
+
+    A call that creates something may have succeeded on the server even
+    though its response was lost, so give such calls a `recover` check to
+    run before each retry.
+
+    Args:
+        func (Callable[..., T]): API call.
+        *args: Arguments for the call.
+        retries (int): Retries after the first attempt.
+        backoff (float): Seconds before the first retry, doubling each time.
+        recover (Callable[[], T | None] | None): Provides the result of a
+            failed attempt that took effect, or None to retry.
+        **kwargs: Keyword arguments for the call.
+
+    Raises:
+        requests.RequestException: Error from the final attempt, or any
+            client error (4xx other than 429) straight away.
+
+    Returns:
+        T: Result of the call.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except requests.HTTPError as e:
+            status_code = e.response.status_code
+            if attempt == retries or (
+                status_code < 500 and status_code != 429
+            ):
+                raise
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        time.sleep(backoff * 2**attempt)
+        if recover is not None:
+            result = retry(recover, retries=retries, backoff=backoff)
+            if result is not None:
+                return result
+
+
+def _athlete_key(athlete: AthleteType) -> tuple[str, str, int]:
+    """Identify an athlete within a file."""
+    return (athlete["first_name"], athlete["last_name"], athlete["yearborn"])
+
+
+def _created_athlete(api: LifterAPI, athlete: AthleteType) -> dict | None:
+    """Find an athlete with exactly these details, e.g. after a lost POST.
+
+    Args:
+        api (LifterAPI): API client.
+        athlete (AthleteType): Athlete that may have been created.
+
+    Returns:
+        dict | None: Athlete from the API, or None if not found.
+    """
+    search = f"{athlete['first_name']} {athlete['last_name']}"
+    for result in api.find_athlete(search)["results"]:
+        if (
+            result["first_name"] == athlete["first_name"]
+            and result["last_name"] == athlete["last_name"]
+            and result["yearborn"] == athlete["yearborn"]
+        ):
+            return result
+    return None
+
+
+def upload_lifts(
+    api: LifterAPI,
+    lifts: list[LiftType],
+    competition_id: str,
+    find_athlete_id: Callable[[AthleteType], str | None],
+    workers: int = WORKERS,
+    create_athlete: Callable[..., dict] | None = None,
+    ledger: UploadLedger | None = None,
+    file_hash: str = "",
+    athlete_exists: Callable[[str], bool] | None = None,
+) -> Iterator[UploadResult]:
+    """Upload lifts concurrently, creating athletes that do not exist.
+
+    Each distinct athlete is looked up once, in turn and before any
+    uploads, so `find_athlete_id` may ask the user about ambiguous matches.
+    New athletes and then the lifts are created on a pool of `workers`
+    threads, so share a `client.PooledLifterAPI` to reuse connections. A
+    lift that fails because the athlete is already in the competition is
+    skipped; the competition's lifts are fetched at most once to check
+    this.
+
+    Creating an athlete or lift is only retried once the API shows it was
+    not created, so a lost response does not make a duplicate.
+
+    With a `ledger`, athletes and lifts already uploaded from the file are
+    skipped without any requests, and new uploads are recorded. The ledger
+    does not know when athletes are deleted from the API, so its athlete
+    IDs are only used when `athlete_exists` confirms them.
+
+    >>> for result in upload_lifts(api, comp.lifts, competition_id, find):
+    ...     print(result.athlete_id)
+
+    Args:
+        api (LifterAPI): API client.
+        lifts (list[LiftType]): Lifts as provided by `CompetitionFile`.
+        competition_id (str): Competition to add the lifts to.
+        find_athlete_id (Callable[[AthleteType], str | None]): Athlete ID
+            lookup, returning None for a new athlete. Not retried.
+        workers (int): Concurrent requests.
+        create_athlete (Callable[..., dict] | None): Creates an athlete,
+            e.g. `athletes.AthleteIndex.create_athlete` to keep an index up
+            to date. Defaults to `api.create_athlete`.
+        ledger (UploadLedger | None): Record of uploads to skip and add to.
+        file_hash (str): Digest of the file the lifts are from, see
+            `utils.cache.file_digest`. Required with a `ledger`.
+        athlete_exists (Callable[[str], bool] | None): Whether an athlete ID
+            is still in the API, e.g. checked against `athletes.AthleteIndex`
+            after a refresh. Without it, athletes are
+            always looked up with `find_athlete_id`.
+
+    Raises:
+        requests.HTTPError: Lift could not be created.
+
+    Yields:
+        UploadResult: Result for each lift, in the order of `lifts`.
+    """
+    if create_athlete is None:
+        create_athlete = api.create_athlete
+    athletes = {
+        _athlete_key(lift["athlete"]): lift["athlete"] for lift in lifts
+    }
+
+    competition_lifts = None
+    lock = threading.Lock()
+
+    def existing_lifts() -> dict[str, str | None]:
+        """Lift IDs by athlete ID in the competition, fetched once."""
+        nonlocal competition_lifts
+        with lock:
+            if competition_lifts is None:
+                competition_lifts = {
+                    lift["athlete"]: lift.get("reference_id")
+                    for lift in retry(api.lifts, competition_id=competition_id)
+                }
+        return competition_lifts
+
+    def lookup(athlete: AthleteType) -> str | None:
+        if ledger is not None and athlete_exists is not None:
+            athlete_id = ledger.athlete_id(file_hash, athlete)
+            if athlete_id is not None and athlete_exists(athlete_id):
+                return athlete_id
+        athlete_id = find_athlete_id(athlete)
+        if athlete_id is not None and ledger is not None:
+            ledger.record_athlete(file_hash, athlete, athlete_id)
+        return athlete_id
+
+    def create(athlete: AthleteType) -> str:
+        athlete_id = retry(
+            create_athlete,
+            recover=lambda: _created_athlete(api, athlete),
+            **athlete,
+        )["reference_id"]
+        if ledger is not None:
+            ledger.record_athlete(file_hash, athlete, athlete_id)
+        return athlete_id
+
+    def created_lift(athlete_id: str) -> dict | None:
+        for lift in api.lifts(competition_id=competition_id):
+            if lift["athlete"] == athlete_id:
+                return lift
+        return None
+
+    def upload(lift: LiftType) -> UploadResult:
+        athlete = lift["athlete"]
+        athlete_id, athlete_created = athlete_ids[_athlete_key(athlete)]
+        lift = {k: v for k, v in lift.items() if k != "athlete"}
+        key = (file_hash, competition_id, athlete_id, lift["lottery_number"])
+        if ledger is not None:
+            lift_id = ledger.lift_id(*key)
+            if lift_id is not None:
+                return UploadResult(
+                    athlete, athlete_id, athlete_created, lift_id, True
+                )
+        try:
+            lift_id = retry(
+                api.create_lift,
+                recover=lambda: created_lift(athlete_id),
+                athlete_id=athlete_id,
+                competition_id=competition_id,
+                **lift,
+            )["reference_id"]
+            recorded_id = lift_id
+        except requests.HTTPError:
+            if athlete_id not in existing_lifts():
+                raise
+            lift_id = None
+            recorded_id = existing_lifts()[athlete_id]
+        if ledger is not None and recorded_id is not None:
+            ledger.record_lift(*key, recorded_id)
+        return UploadResult(athlete, athlete_id, athlete_created, lift_id)
+
+    found = {key: lookup(athlete) for key, athlete in athletes.items()}
+    new = [key for key, athlete_id in found.items() if athlete_id is None]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        created = dict(
+            zip(new, executor.map(create, (athletes[key] for key in new)))
+        )
+        athlete_ids = {
+            key: (
+                (created[key], True) if key in created else (athlete_id, False)
+            )
+            for key, athlete_id in found.items()
+        }
+        yield from executor.map(upload, lifts)
@@ -0,0 +1,101 @@
+"""On-disk cache of parsed files."""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, BinaryIO
+
+# 256 MiB
+MAX_BYTES = 256 * 2**20
+
+
+def file_digest(file: Path | BinaryIO) -> str:
+    """Hash the contents of a file.
+
+    Args:
+        file (Path | BinaryIO): File path or an uploaded (in memory) file.
+
+    Returns:
+        str: SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    if hasattr(file, "getvalue"):
+        digest.update(file.getvalue())
+        return digest.hexdigest()
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(2**20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Pickled values in a directory, evicting the least recently used.
+
+    >>> cache = ParseCache(Path(".cache"))
+    >>> cache.put("key", {"parsed": "data"})
+    >>> cache.get("key")
+    {'parsed': 'data'}
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = MAX_BYTES) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pickle"
+
+    def get(self, key: str) -> Any | None:
+        """Load a value.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Any | None: Cached value, or None if it is not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        # mark as recently used, unless evicted meanwhile
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, then evict old values if over `max_bytes`.
+
+        Args:
+            key (str): Cache key.
+            value (Any): Picklable value.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used values until under `max_bytes`."""
+        files = []
+        for path in self.cache_dir.glob("*.pickle"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # evicted by another process
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
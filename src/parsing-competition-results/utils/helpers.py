@@ -1,10 +1,73 @@
 """Utility functions."""
 
-from typing import Union
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Union
 
 import math
 import datetime
 
+import numpy as np
+import pandas as pd
+
+from utils.timing import span
+
+# distinct values remembered by each scalar helper, shared across files
+CACHE_SIZE = 4096
+
+DATE_INPUT_FORMAT = "%d/%m/%Y"
+DATE_OUTPUT_FORMAT = "%Y-%m-%d"
+
+WEIGHT_CATEGORY_EXCELMACRO = {
+    "48kg": "W48",
+    "53kg": "W53",
+    "58kg": "W58",
+    "63kg": "W63",
+    "75kg": "W75",
+    "69kgw": "W69",
+    "90kg": "W90",
+    "90+kg": "W90+",
+    "56kg": "M56",
+    "62kg": "M62",
+    "69kgm": "M69",
+    "77kg": "M77",
+    "85kg": "M85",
+    "94kg": "M94",
+    "105kg": "M105",
+    "105+kg": "M105+",
+}
+
+
+def _map_unique(func: Callable[[Any], Any], values: Any) -> np.ndarray:
+    """Apply a function once per distinct value.
+
+    >>> _map_unique(str.upper, ["a", "b", "a"])
+    array(['A', 'B', 'A'], dtype=object)
+
+    Args:
+        func (Callable[[Any], Any]): Scalar function.
+        values (Any): Array-like of values.
+
+    Returns:
+        (np.ndarray): Results, in the order of `values`.
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    # missing values are coded -1, so they take the last result
+    results = np.empty(len(uniques) + 1, dtype=object)
+    for i, value in enumerate(uniques):
+        results[i] = func(value)
+    missing = codes == -1
+    if missing.any():
+        results[-1] = func(np.asarray(values, dtype=object)[missing][0])
+    return results[codes]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _convert_date_string(date_string: str) -> str:
+    return datetime.datetime.strptime(date_string, DATE_INPUT_FORMAT).strftime(
+        DATE_OUTPUT_FORMAT
+    )
+
 
 def convert_date(date_string: Union[str, datetime.datetime]):
     """Convert datestring from 'D/MM/YYYY' to 'YYYY-MM-DD'.
@@ -18,13 +81,25 @@ def convert_date(date_string: Union[str, datetime.datetime]):
     Returns:
         (str): Date for the API.
     """
-    dt_input = date_string
-    if not isinstance(date_string, datetime.datetime):
-        input_format = "%d/%m/%Y"
-        dt_input = datetime.datetime.strptime(date_string, input_format)
-    output_format = "%Y-%m-%d"
-    output = datetime.datetime.strftime(dt_input, output_format)
-    return output
+    if isinstance(date_string, datetime.datetime):
+        return datetime.datetime.strftime(date_string, DATE_OUTPUT_FORMAT)
+    return _convert_date_string(date_string)
+
+
+@span("helpers.convert_dates")
+def convert_dates(date_strings: Any) -> np.ndarray:
+    """Convert an array of dates, see `convert_date`.
+
+    >>> convert_dates(pd.Series(["5/06/2022", "5/06/2022"]))
+    array(['2022-06-05', '2022-06-05'], dtype=object)
+
+    Args:
+        date_strings (Any): Array-like of entry dates.
+
+    Returns:
+        (np.ndarray): Dates for the API.
+    """
+    return _map_unique(convert_date, date_strings)
 
 
 def parse_lift_number(lift_number: float) -> int:
@@ -72,27 +147,90 @@ def determine_lift(lift_number: float) -> str:
         raise Exception("Something went wrong!")
 
 
-def parse_weight_category(weight_category: str) -> str:
-    """Determine the weight category.
+@span("helpers.parse_lift_numbers")
+def parse_lift_numbers(lift_numbers: np.ndarray) -> np.ndarray:
+    """Parse an array of lift weights, see `parse_lift_number`.
 
-    >>> parse_weight_category("M > 109")
-    "M109+"
+    >>> parse_lift_numbers(np.array([float('nan'), -100]))
+    array([  0, 100])
 
     Args:
-        weight_category (str): The weight category.
+        lift_numbers (np.ndarray): Input lift weight numbers.
 
     Returns:
-        (str): Weight category for API.
+        (np.ndarray): Lift weight numbers for the API.
     """
+    lift_numbers = np.asarray(lift_numbers, dtype=float)
+    return np.where(np.isnan(lift_numbers), 0, np.abs(lift_numbers)).astype(
+        int
+    )
+
+
+@span("helpers.determine_lifts")
+def determine_lifts(lift_numbers: np.ndarray) -> np.ndarray:
+    """Determine an array of lift statuses, see `determine_lift`.
+
+    >>> determine_lifts(np.array([0, 100, -100]))
+    array(['DNA', 'LIFT', 'NOLIFT'], dtype=object)
+
+    Args:
+        lift_numbers (np.ndarray): Input lift weight numbers.
+
+    Returns:
+        (np.ndarray): Lift statuses.
+    """
+    lift_numbers = np.asarray(lift_numbers, dtype=float)
+    # object array so every status refers to the same three strings
+    return np.select(
+        [lift_numbers > 0, lift_numbers < 0],
+        np.array(["LIFT", "NOLIFT"], dtype=object),
+        "DNA",
+    )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_weight_category(weight_category: str) -> str:
     if ">" in weight_category:
         weight_category = weight_category.replace(">", "")
         weight_category += "+"
-    if weight_category[0] == "F":
+    if weight_category.startswith("F"):
         weight_category = weight_category.replace("F", "W")
     weight_category = weight_category.replace(" ", "")
     return weight_category
 
 
+def parse_weight_category(weight_category: str) -> str:
+    """Determine the weight category.
+
+    >>> parse_weight_category("M > 109")
+    "M109+"
+
+    Args:
+        weight_category (str): The weight category.
+
+    Returns:
+        (str): Weight category for API.
+    """
+    return _parse_weight_category(weight_category)
+
+
+@span("helpers.parse_weight_categories")
+def parse_weight_categories(weight_categories: pd.Series) -> pd.Series:
+    """Determine the weight categories, see `parse_weight_category`.
+
+    Args:
+        weight_categories (pd.Series): The weight categories.
+
+    Returns:
+        (pd.Series): Weight categories for API.
+    """
+    return pd.Series(
+        _map_unique(parse_weight_category, weight_categories),
+        index=weight_categories.index,
+        dtype=object,
+    )
+
+
 def parse_weight_category_excelmacro(weight_category: str) -> str:
     """Determine the weight category for excel macro type files.
 
@@ -105,39 +243,26 @@ def parse_weight_category_excelmacro(weight_category: str) -> str:
     Returns:
         (str): Weight category for API.
     """
-    CONVERSION = {
-        "48kg": "W48",
-        "53kg": "W53",
-        "58kg": "W58",
-        "63kg": "W63",
-        "75kg": "W75",
-        "69kgw": "W69",
-        "90kg": "W90",
-        "90+kg": "W90+",
-        "56kg": "M56",
-        "62kg": "M62",
-        "69kgm": "M69",
-        "77kg": "M77",
-        "85kg": "M85",
-        "94kg": "M94",
-        "105kg": "M105",
-        "105+kg": "M105+",
-    }
-    return CONVERSION[weight_category.lower()]
+    return WEIGHT_CATEGORY_EXCELMACRO[weight_category.lower()]
 
 
-def name_parser(name: str) -> dict:
-    """Parse name and return first and last name.
+@span("helpers.parse_weight_categories_excelmacro")
+def parse_weight_categories_excelmacro(weight_categories: Any) -> np.ndarray:
+    """Determine the weight categories for excel macro type files.
 
-    >>> name_parse("Karu Te Moana")
-    { "first_name": "Karu", "last_name": "Te Moana"}
+    See `parse_weight_category_excelmacro`.
 
     Args:
-        name (str): The full name.
+        weight_categories (Any): Array-like of weight categories.
 
     Returns:
-        dict: The first and last name.
+        (np.ndarray): Weight categories for API.
     """
+    return _map_unique(parse_weight_category_excelmacro, weight_categories)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_name(name: str) -> tuple[str, str]:
     lst = name.split(" ")
     if len(lst) == 1:
         first_name = lst[0]
@@ -150,4 +275,41 @@ def name_parser(name: str) -> dict:
             last_name = " ".join(middle) + " " + last_name
         else:
             first_name += " " + " ".join(middle)
+    return first_name, last_name
+
+
+def name_parser(name: str) -> dict:
+    """Parse name and return first and last name.
+
+    >>> name_parse("Karu Te Moana")
+    { "first_name": "Karu", "last_name": "Te Moana"}
+
+    Args:
+        name (str): The full name.
+
+    Returns:
+        dict: The first and last name.
+    """
+    first_name, last_name = _parse_name(name)
     return {"first_name": first_name, "last_name": last_name}
+
+
+@span("helpers.parse_names")
+def parse_names(names: Any) -> dict[str, np.ndarray]:
+    """Parse an array of names, see `name_parser`.
+
+    >>> parse_names(pd.Series(["Karu Te Moana", "Ann Lee"]))
+    {'first_name': array(['Karu', 'Ann'], dtype=object),
+     'last_name': array(['Te Moana', 'Lee'], dtype=object)}
+
+    Args:
+        names (Any): Array-like of full names.
+
+    Returns:
+        dict[str, np.ndarray]: First and last names.
+    """
+    parsed = _map_unique(_parse_name, names)
+    return {
+        "first_name": np.array([name[0] for name in parsed], dtype=object),
+        "last_name": np.array([name[1] for name in parsed], dtype=object),
+    }
@@ -0,0 +1,152 @@
+"""Local record of uploaded lifts."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from utils.types import AthleteType
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS athletes (
+    file_hash TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    yearborn INTEGER NOT NULL,
+    athlete_id TEXT NOT NULL,
+    PRIMARY KEY (file_hash, first_name, last_name, yearborn)
+);
+CREATE TABLE IF NOT EXISTS lifts (
+    file_hash TEXT NOT NULL,
+    competition_id TEXT NOT NULL,
+    athlete_id TEXT NOT NULL,
+    lottery_number INTEGER NOT NULL,
+    lift_id TEXT NOT NULL,
+    PRIMARY KEY (file_hash, competition_id, athlete_id, lottery_number)
+);
+"""
+
+
+class UploadLedger:
+    """Athletes and lifts uploaded from each file, in SQLite.
+
+    Rows are written as each upload completes, so a rerun after an
+    interruption (or of the same file) skips what is already uploaded
+    without asking the API. Safe to share between threads.
+
+    >>> ledger = UploadLedger(Path(".cache/uploads.sqlite"))
+    >>> ledger.lift_id(file_hash, "ab345l", "123def7", 4)
+    'l9x8y7'
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the database."""
+        self._connection.close()
+
+    def athlete_id(self, file_hash: str, athlete: AthleteType) -> str | None:
+        """Find the ID an athlete from a file was uploaded as.
+
+        Args:
+            file_hash (str): File digest, see `utils.cache.file_digest`.
+            athlete (AthleteType): Athlete from the file.
+
+        Returns:
+            str | None: Athlete reference ID, or None if not recorded.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT athlete_id FROM athletes WHERE file_hash = ?"
+                " AND first_name = ? AND last_name = ? AND yearborn = ?",
+                (
+                    file_hash,
+                    athlete["first_name"],
+                    athlete["last_name"],
+                    int(athlete["yearborn"]),
+                ),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def record_athlete(
+        self, file_hash: str, athlete: AthleteType, athlete_id: str
+    ) -> None:
+        """Record the ID an athlete from a file was uploaded as.
+
+        Args:
+            file_hash (str): File digest.
+            athlete (AthleteType): Athlete from the file.
+            athlete_id (str): Athlete reference ID.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO athletes VALUES (?, ?, ?, ?, ?)",
+                (
+                    file_hash,
+                    athlete["first_name"],
+                    athlete["last_name"],
+                    int(athlete["yearborn"]),
+                    athlete_id,
+                ),
+            )
+
+    def lift_id(
+        self,
+        file_hash: str,
+        competition_id: str,
+        athlete_id: str,
+        lottery_number: int,
+    ) -> str | None:
+        """Find an uploaded lift.
+
+        Args:
+            file_hash (str): File digest.
+            competition_id (str): Competition reference ID.
+            athlete_id (str): Athlete reference ID.
+            lottery_number (int): Lottery number.
+
+        Returns:
+            str | None: Lift reference ID, or None if not uploaded.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT lift_id FROM lifts WHERE file_hash = ?"
+                " AND competition_id = ? AND athlete_id = ?"
+                " AND lottery_number = ?",
+                (file_hash, competition_id, athlete_id, int(lottery_number)),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def record_lift(
+        self,
+        file_hash: str,
+        competition_id: str,
+        athlete_id: str,
+        lottery_number: int,
+        lift_id: str,
+    ) -> None:
+        """Record an uploaded lift.
+
+        Args:
+            file_hash (str): File digest.
+            competition_id (str): Competition reference ID.
+            athlete_id (str): Athlete reference ID.
+            lottery_number (int): Lottery number.
+            lift_id (str): Lift reference ID.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO lifts VALUES (?, ?, ?, ?, ?)",
+                (
+                    file_hash,
+                    competition_id,
+                    athlete_id,
+                    int(lottery_number),
+                    lift_id,
+                ),
+            )
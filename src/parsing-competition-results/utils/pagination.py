@@ -0,0 +1,146 @@
+"""Concurrent iteration over paginated API resources."""
+
+import itertools
+import math
+from collections import deque
+from collections.abc import Callable, Collection, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# pages fetched at once
+WORKERS = 8
+
+
+class Paginator:
+    """Results of a paginated resource, fetched concurrently.
+
+    `fetch_page` is called with `page=` and returns a page in the lifter-api
+    format, with "count", "next" and "results". The first page is fetched
+    on its own to learn the count and page size, then the remaining pages
+    are fetched up to `workers` at a time. Results are yielded in order as
+    pages arrive, so breaking out of the loop stops further requests.
+    `start` and `page_size` allow resuming from a later page.
+
+    With `reverse`, the pages after the first are fetched last page first
+    and the first page is yielded last. Results can then be deleted as they
+    arrive, as deleting them does not shift the pages still to come.
+
+    >>> competitions = Paginator(api.competitions)
+    >>> for competition in competitions:
+    ...     print(competition["reference_id"])
+    >>> competitions.count
+    42
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[..., dict],
+        start: int = 1,
+        page_size: int | None = None,
+        workers: int = WORKERS,
+        reverse: bool = False,
+    ) -> None:
+        self.fetch_page = fetch_page
+        self.start = start
+        self.page_size = page_size
+        self.workers = workers
+        self.reverse = reverse
+        # total results, known once the first page has been fetched
+        self.count = None
+
+    def pages(self) -> Iterator[dict]:
+        """Fetch the pages in order, or in reverse order.
+
+        Yields:
+            dict: Page with "count", "next" and "results".
+        """
+        first = self.fetch_page(page=self.start)
+        self.count = first["count"]
+        if not self.reverse:
+            yield first
+        if first["next"] is not None:
+            if self.page_size is None:
+                self.page_size = len(first["results"])
+            last_page = math.ceil(self.count / self.page_size)
+            pages = range(self.start + 1, last_page + 1)
+            yield from self._fetch(reversed(pages) if self.reverse else pages)
+        if self.reverse:
+            yield first
+
+    def _fetch(self, pages: Iterable[int]) -> Iterator[dict]:
+        """Fetch pages concurrently, yielding them in the order given."""
+        pages = iter(pages)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        futures = deque()
+        try:
+            for page in itertools.islice(pages, self.workers):
+                futures.append(executor.submit(self.fetch_page, page=page))
+            while futures:
+                response = futures.popleft().result()
+                page = next(pages, None)
+                if page is not None:
+                    futures.append(executor.submit(self.fetch_page, page=page))
+                yield response
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __iter__(self) -> Iterator[dict]:
+        for response in self.pages():
+            yield from response["results"]
+
+
+def sync(
+    fetch_page: Callable[..., dict],
+    add: Callable[[dict], None],
+    known: Collection[str] = (),
+    synced: int = 0,
+    page_size: int | None = None,
+    workers: int = WORKERS,
+) -> tuple[int, int | None] | None:
+    """Fetch the results added to a paginated resource since the last sync.
+
+    Fetching resumes from the page holding the last result seen, as the
+    lifter-api lists results in the order they were created, and starts
+    from the first page without a `page_size`. The list endpoints take no
+    ordering, so a resumed sync is only trusted if the results then known
+    match the count, as a result listed out of order would be missed.
+
+    >>> synced, page_size = sync(api.athletes, index.add)
+    >>> sync(api.athletes, index.add, index.athletes, synced, page_size)
+    (43, 20)
+
+    Args:
+        fetch_page (Callable[..., dict]): Fetches a page, see `Paginator`.
+        add (Callable[[dict], None]): Called with each result fetched.
+        known (Collection[str]): Reference IDs of the results known, kept
+            up to date by `add`.
+        synced (int): Results seen by the last sync.
+        page_size (int | None): Page size seen by the last sync.
+        workers (int): Pages fetched at once.
+
+    Returns:
+        tuple[int, int | None] | None: Results in the resource and its page
+            size, or None if results have been deleted or listed out of
+            order since the last sync, so it has to start again from the
+            first page.
+    """
+    # from the last page seen, in case it was not full
+    start = 1 if page_size is None else max(synced - 1, 0) // page_size + 1
+    results = Paginator(
+        fetch_page, start=start, page_size=page_size, workers=workers
+    )
+    try:
+        for page in results.pages():
+            if results.count < synced:
+                return None
+            for result in page["results"]:
+                add(result)
+    except requests.HTTPError as e:
+        # the last page seen no longer exists
+        if start == 1 or e.response.status_code != 404:
+            raise
+        return None
+    if synced and len(known) != results.count:
+        return None
+    return results.count, results.page_size
@@ -0,0 +1,235 @@
+"""Timings of parsing and upload stages.
+
+Stages are timed with `span`, as a context manager or decorator, and
+aggregated in `TIMINGS`. Spans can nest, so the total of a stage includes
+any stages within it.
+
+>>> with span("file.extract"):
+...     comp.extract(*comp.sheetnames)
+>>> TIMINGS.summary()["file.extract"]
+{'count': 1, 'total': 0.41, 'p50': 0.41, 'p95': 0.41}
+
+With `PROFILE_ENV` set, outermost spans are also profiled with `cProfile`
+and `tracemalloc`, one at a time as `tracemalloc` is shared by every
+thread; spans starting while another is profiled are only timed. Peak
+memory is that of the process while the span ran.
+
+Spans in worker processes, such as `file.parse_sheet` when a file has
+`workers` > 1, are timed in those processes and not recorded.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from utils.types import TimingType
+
+# set to "1" to profile spans
+PROFILE_ENV = "PARSING_PROFILE"
+# functions listed per profiled stage
+PROFILE_LINES = 20
+# durations kept per stage for percentiles
+MAX_SAMPLES = 1024
+
+
+def profiling() -> bool:
+    """Check whether spans are profiled, see `PROFILE_ENV`."""
+    return os.getenv(PROFILE_ENV, "") not in ("", "0")
+
+
+class Timings:
+    """Durations of each stage, safe to record from several threads.
+
+    Counts and totals cover every duration. Percentiles are estimated from
+    a uniform sample of at most `MAX_SAMPLES` durations per stage, so a
+    long-running process does not keep them all.
+
+    >>> timings = Timings()
+    >>> timings.record("api.GET athletes", 0.12)
+    >>> timings.to_json()
+    '{"stages": {"api.GET athletes": {"count": 1, ...}}, "profiles": {}}'
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counts = defaultdict(int)
+        self._totals = defaultdict(float)
+        self._samples = defaultdict(list)
+        self._peaks = {}
+        self._profiles = {}
+        self._profiling = False
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add a duration to a stage.
+
+        Args:
+            stage (str): Stage name.
+            seconds (float): Time taken.
+        """
+        with self._lock:
+            self._counts[stage] += 1
+            self._totals[stage] += seconds
+            samples = self._samples[stage]
+            if len(samples) < MAX_SAMPLES:
+                samples.append(seconds)
+            else:
+                # reservoir sampling
+                i = random.randrange(self._counts[stage])
+                if i < MAX_SAMPLES:
+                    samples[i] = seconds
+
+    def reset(self) -> None:
+        """Forget every duration and profile."""
+        with self._lock:
+            self._counts.clear()
+            self._totals.clear()
+            self._samples.clear()
+            self._peaks.clear()
+            self._profiles.clear()
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the enclosed code as a stage.
+
+        Args:
+            stage (str): Stage name.
+
+        Yields:
+            None: While the stage runs.
+        """
+        outermost = not getattr(self._local, "active", False)
+        profile = outermost and profiling() and self._claim_profiler()
+        self._local.active = True
+        if profile:
+            profiler = cProfile.Profile()
+            tracing = tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if profile:
+                profiler.disable()
+                peak = tracemalloc.get_traced_memory()[1]
+                if not tracing:
+                    tracemalloc.stop()
+                self._add_profile(stage, profiler, peak)
+            if outermost:
+                self._local.active = False
+            self.record(stage, seconds)
+
+    def _claim_profiler(self) -> bool:
+        """Claim profiling for one span, unless another span has it."""
+        with self._lock:
+            if self._profiling:
+                return False
+            self._profiling = True
+            return True
+
+    def _add_profile(
+        self, stage: str, profiler: cProfile.Profile, peak: int
+    ) -> None:
+        """Merge a stage's profile and peak memory, releasing profiling."""
+        with self._lock:
+            self._profiling = False
+            self._peaks[stage] = max(self._peaks.get(stage, 0), peak)
+            if stage in self._profiles:
+                self._profiles[stage].add(profiler)
+            else:
+                self._profiles[stage] = pstats.Stats(profiler)
+
+    def summary(self) -> dict[str, TimingType]:
+        """Aggregate the durations of each stage.
+
+        Returns:
+            dict[str, TimingType]: Stage name to count, total, median and
+                95th percentile in seconds, and peak bytes allocated when
+                profiled.
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+            samples = {k: list(v) for k, v in self._samples.items()}
+            peaks = dict(self._peaks)
+        summary = {}
+        for stage, seconds in sorted(samples.items()):
+            p50, p95 = np.percentile(seconds, [50, 95])
+            summary[stage] = {
+                "count": counts[stage],
+                "total": totals[stage],
+                "p50": float(p50),
+                "p95": float(p95),
+            }
+            if stage in peaks:
+                summary[stage]["peak_bytes"] = peaks[stage]
+        return summary
+
+    def profiles(self) -> dict[str, str]:
+        """Provide the most expensive functions of each profiled stage.
+
+        Returns:
+            dict[str, str]: Stage name to `pstats` listing, by cumulative
+                time.
+        """
+        with self._lock:
+            profiles = dict(self._profiles)
+        listings = {}
+        for stage, stats in sorted(profiles.items()):
+            stream = io.StringIO()
+            stats.stream = stream
+            stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+            listings[stage] = stream.getvalue()
+        return listings
+
+    def to_json(self, path: Path | None = None) -> str:
+        """Export the summary and profiles as JSON.
+
+        Args:
+            path (Path | None): File to also write the JSON to.
+
+        Returns:
+            str: JSON with "stages" and "profiles".
+        """
+        text = json.dumps(
+            {"stages": self.summary(), "profiles": self.profiles()},
+            indent=2,
+        )
+        if path is not None:
+            Path(path).write_text(text)
+        return text
+
+
+TIMINGS = Timings()
+
+
+def span(stage: str):
+    """Time a stage in `TIMINGS`, as a context manager or decorator.
+
+    >>> @span("helpers.parse_names")
+    ... def parse_names(names): ...
+
+    Args:
+        stage (str): Stage name.
+
+    Returns:
+        Context manager that also decorates functions.
+    """
+    return TIMINGS.span(stage)
@@ -1,5 +1,6 @@
 """Types."""
 
+from dataclasses import dataclass
 from typing import TypedDict
 
 
@@ -19,4 +20,96 @@ class AthleteType(TypedDict):
 
 
 class LiftType(TypedDict):
-    pass
+    """Lift type."""
+
+    athlete: AthleteType
+    lottery_number: int
+    snatch_first: str
+    snatch_first_weight: int
+    snatch_second: str
+    snatch_second_weight: int
+    snatch_third: str
+    snatch_third_weight: int
+    cnj_first: str
+    cnj_first_weight: int
+    cnj_second: str
+    cnj_second_weight: int
+    cnj_third: str
+    cnj_third_weight: int
+    bodyweight: float
+    weight_category: str
+    team: str
+    session_number: int
+
+
+class _ProfiledTimingType(TypedDict, total=False):
+    peak_bytes: int
+
+
+class TimingType(_ProfiledTimingType):
+    """Stage timing type, in seconds."""
+
+    count: int
+    total: float
+    p50: float
+    p95: float
+
+
+@dataclass(frozen=True, slots=True)
+class AthleteRecord:
+    """Compact, immutable athlete."""
+
+    first_name: str
+    last_name: str
+    yearborn: int
+
+    def to_dict(self) -> AthleteType:
+        """Provide the athlete as `api.create_athlete` keyword arguments."""
+        return {
+            "first_name": self.first_name,
+            "last_name": self.last_name,
+            "yearborn": self.yearborn,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class LiftRecord:
+    """Compact, immutable lift.
+
+    Holds the same fields as `LiftType` without a dictionary per lift.
+    """
+
+    athlete: AthleteRecord
+    lottery_number: int
+    snatch_first: str
+    snatch_first_weight: int
+    snatch_second: str
+    snatch_second_weight: int
+    snatch_third: str
+    snatch_third_weight: int
+    cnj_first: str
+    cnj_first_weight: int
+    cnj_second: str
+    cnj_second_weight: int
+    cnj_third: str
+    cnj_third_weight: int
+    bodyweight: float
+    weight_category: str = ""
+    team: str = ""
+    session_number: int = 0
+
+    @classmethod
+    def from_dict(cls, lift: LiftType) -> "LiftRecord":
+        """Create from the dictionary shape used by `api.create_lift`."""
+        return cls(
+            **{
+                **lift,
+                "athlete": AthleteRecord(**lift["athlete"]),
+            }
+        )
+
+    def to_dict(self) -> LiftType:
+        """Provide the lift in the dictionary shape for `api.create_lift`."""
+        lift = {name: getattr(self, name) for name in self.__slots__}
+        lift["athlete"] = self.athlete.to_dict()
+        return lift
@@ -0,0 +1,32 @@
+"""Fixtures."""
+
+import pytest
+
+from tests.stub_api import StubAPI
+from tests.workbooks import make_excelmacro_workbook, make_owlcms_workbook
+
+
+@pytest.fixture
+def owlcms_file(tmp_path):
+    """Provide a small owlcms results file."""
+    path = tmp_path / "owlcms.xlsx"
+    make_owlcms_workbook(path)
+    return path
+
+
+@pytest.fixture
+def excelmacro_file(tmp_path):
+    """Provide a small excel macro results file."""
+    path = tmp_path / "excelmacro.xlsx"
+    make_excelmacro_workbook(path)
+    return path
+
+
+@pytest.fixture
+def stub_api():
+    """Provide a local lifter-api, with its URL as `stub_api.url`."""
+    stub = StubAPI()
+    server = stub.serve()
+    stub.url = f"http://127.0.0.1:{server.server_port}"
+    yield stub
+    server.shutdown()
@@ -0,0 +1,164 @@
+"""Local stand-in for the lifter-api."""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 3
+
+
+class StubAPI:
+    """In-memory athletes, competitions and lifts served over HTTP.
+
+    `fail` maps a "METHOD path" pattern to the number of 503 responses to
+    give before succeeding. `lose` does the same, but handles each request
+    before responding 503, as if the response were lost.
+    """
+
+    def __init__(self) -> None:
+        self.athletes = {}
+        self.competitions = {}
+        self.lifts = {}
+        self.requests = []
+        self.fail = {}
+        self.lose = {}
+        self._lock = threading.Lock()
+        self._ids = 0
+
+    def new_id(self, prefix: str) -> str:
+        """Provide a new reference ID."""
+        with self._lock:
+            self._ids += 1
+            return f"{prefix}{self._ids}"
+
+    def page(self, path: str, items: list, page: int) -> dict | None:
+        """Paginate like the lifter-api, None for a page out of range."""
+        start = (page - 1) * PAGE_SIZE
+        if page > 1 and start >= len(items):
+            return None
+        last = start + PAGE_SIZE >= len(items)
+        return {
+            "count": len(items),
+            "next": None if last else f"http://stub/v1/{path}?page={page + 1}",
+            "previous": None,
+            "results": items[start : start + PAGE_SIZE],
+        }
+
+    def paginated(self, path: str, items: list, page: int):
+        """Provide the status code and JSON body for a page."""
+        response = self.page(path, items, page)
+        if response is None:
+            return 404, {"detail": "Invalid page."}
+        return 200, response
+
+    def handle(self, method: str, path: str, query: dict, body: dict):
+        """Provide the status code and JSON body for a request."""
+        self.requests.append(f"{method} {path}")
+        for pattern, count in self.fail.items():
+            if count and re.fullmatch(pattern, f"{method} {path}"):
+                self.fail[pattern] -= 1
+                return 503, {"detail": "unavailable"}
+        response = self._handle(method, path, query, body)
+        for pattern, count in self.lose.items():
+            if count and re.fullmatch(pattern, f"{method} {path}"):
+                self.lose[pattern] -= 1
+                return 503, {"detail": "unavailable"}
+        return response
+
+    def _handle(self, method: str, path: str, query: dict, body: dict):
+        """Provide the status code and JSON body, as the API would."""
+        page = int(query.get("page", ["1"])[0])
+        if path in ("/api/token/verify", "/api/token/refresh/"):
+            return 200, {"code": "ok", "access": "access"}
+        if path == "/v1":
+            return 200, {}
+        if path == "/v1/athletes" and method == "GET":
+            search = query.get("search", [""])[0].lower()
+            athletes = [
+                a
+                for a in self.athletes.values()
+                if search in f"{a['first_name']} {a['last_name']}".lower()
+            ]
+            return self.paginated("athletes", athletes, page)
+        if path == "/v1/athletes" and method == "POST":
+            athlete = {**body, "reference_id": self.new_id("a")}
+            self.athletes[athlete["reference_id"]] = athlete
+            return 201, athlete
+        if path == "/v1/competitions" and method == "GET":
+            competitions = list(self.competitions.values())
+            return self.paginated("competitions", competitions, page)
+        if path == "/v1/competitions" and method == "POST":
+            competition = {**body, "reference_id": self.new_id("c")}
+            self.competitions[competition["reference_id"]] = competition
+            return 201, competition
+        match = re.fullmatch(r"/v1/competitions/(\w+)/lifts", path)
+        if match and method == "GET":
+            return 200, [
+                lift
+                for lift in self.lifts.values()
+                if lift["competition"] == match[1]
+            ]
+        if match and method == "POST":
+            if body["athlete"] not in self.athletes:
+                return 400, {"detail": "athlete does not exist"}
+            if any(
+                lift["athlete"] == body["athlete"]
+                and lift["competition"] == match[1]
+                for lift in self.lifts.values()
+            ):
+                return 400, {"detail": "athlete already in competition"}
+            lift = {**body, "reference_id": self.new_id("l")}
+            self.lifts[lift["reference_id"]] = lift
+            return 201, lift
+        match = re.fullmatch(r"/v1/competitions/(\w+)/lifts/(\w+)", path)
+        if match and method == "DELETE":
+            lift = self.lifts.get(match[2])
+            if lift is None or lift["competition"] != match[1]:
+                return 404, {"detail": "not found"}
+            del self.lifts[match[2]]
+            return 204, None
+        match = re.fullmatch(r"/v1/(athletes|competitions)/(\w+)", path)
+        if match:
+            items = getattr(self, match[1])
+            if match[2] not in items:
+                return 404, {"detail": "not found"}
+            if method == "DELETE":
+                del items[match[2]]
+                return 204, None
+            return 200, items[match[2]]
+        return 404, {"detail": "not found"}
+
+    def serve(self) -> ThreadingHTTPServer:
+        """Start serving on a free local port in a background thread."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self) -> None:
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                if self.headers.get("Content-Type") == "application/json":
+                    body = json.loads(body)
+                status, data = stub.handle(
+                    self.command, url.path, parse_qs(url.query), body
+                )
+                payload = b"" if data is None else json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_DELETE = do_PATCH = _respond
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
@@ -0,0 +1,98 @@
+"""Test."""
+
+from athletes import AthleteIndex, normalize_name
+from client import PooledLifterAPI
+from file import CompetitionFile
+from upload import upload_lifts
+
+
+def athlete(first_name, last_name, yearborn):
+    """Provide an athlete."""
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "yearborn": yearborn,
+    }
+
+
+def test_normalize_name():
+    """Test accents, case and whitespace are ignored."""
+    assert normalize_name(" Tē  Moana ") == "te moana"
+    assert normalize_name("JOHN paul") == normalize_name("John Paul")
+
+
+def test_athlete_index_refresh(stub_api, tmp_path):
+    """Test refreshes only fetch new pages, and the index is saved."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    for i in range(7):
+        api.create_athlete(**athlete(f"First{i}", f"Last{i}", 1990))
+    athletes = AthleteIndex(api, tmp_path / "athletes.json")
+
+    assert athletes.refresh() == 7
+    api.create_athlete(**athlete("Ann", "Lee", 2000))
+    stub_api.requests.clear()
+    assert athletes.refresh() == 8
+
+    # page 3 holds athletes 7 and 8
+    assert stub_api.requests == ["GET /v1/athletes"]
+    assert len(athletes) == 8
+    assert athletes.find_id(athlete("ann", "LEE", 2000)) is not None
+    assert athletes.find_id(athlete("Ann", "Lee", 2001)) is None
+    assert len(AthleteIndex(api, tmp_path / "athletes.json")) == 8
+
+
+def test_athlete_index_refresh_after_delete(stub_api):
+    """Test the index is rebuilt when athletes are deleted."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    ids = [
+        api.create_athlete(**athlete(f"First{i}", "Last", 1990))[
+            "reference_id"
+        ]
+        for i in range(4)
+    ]
+    athletes = AthleteIndex(api)
+    athletes.refresh()
+    api.delete_athlete(ids[0])
+
+    assert athletes.refresh() == 3
+    assert athletes.find(athlete("First0", "Last", 1990)) == []
+
+
+def test_upload_lifts_with_athlete_index(stub_api, owlcms_file):
+    """Test uploads resolve athletes without searching the API."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    lifts = CompetitionFile(owlcms_file).lifts
+    existing = api.create_athlete(**lifts[0]["athlete"])["reference_id"]
+    athletes = AthleteIndex(api)
+    athletes.refresh()
+    stub_api.requests.clear()
+
+    results = list(
+        upload_lifts(
+            api,
+            lifts,
+            "c1",
+            athletes.find_id,
+            create_athlete=athletes.create_athlete,
+        )
+    )
+
+    assert results[0].athlete_id == existing
+    assert not results[0].athlete_created
+    assert all(r.athlete_created for r in results[1:])
+    assert len(athletes) == len(lifts)
+    assert "GET /v1/athletes" not in stub_api.requests
+
+
+def test_athlete_index_refresh_full_pages(stub_api):
+    """Test a refresh after a full last page fetches only that page."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    for i in range(6):
+        api.create_athlete(**athlete(f"First{i}", "Last", 1990))
+    athletes = AthleteIndex(api)
+    athletes.refresh()
+    stub_api.requests.clear()
+
+    assert athletes.refresh() == 6
+    # page 2 holds athletes 4 to 6, and page 3 does not exist
+    assert stub_api.requests == ["GET /v1/athletes"]
@@ -0,0 +1,106 @@
+"""Test."""
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from cli import app, list_competition_files, parse_file
+from file import CompetitionFile
+from tests.workbooks import make_textract_responses
+
+
+def test_textract_directory(owlcms_file, tmp_path):
+    """Test a directory of paged Textract responses is found and parsed."""
+    competition = tmp_path / "data" / "2022" / "comp"
+    competition.mkdir(parents=True)
+    make_textract_responses(owlcms_file, competition / "a.textract.json")
+    make_textract_responses(owlcms_file, competition / "b.textract", 12)
+    (competition / "results.xlsx").write_bytes(owlcms_file.read_bytes())
+
+    files = list_competition_files(tmp_path / "data")
+    output = parse_file(files[1], tmp_path / "b.json", "")
+
+    assert [file.name for file in files] == [
+        "a.textract.json",
+        "b.textract",
+        "results.xlsx",
+    ]
+    with open(output) as f:
+        assert json.load(f)["lifts"] == CompetitionFile(owlcms_file).lifts
+
+
+@pytest.fixture
+def data_dir(owlcms_file, excelmacro_file, tmp_path):
+    """Provide a data directory with an .xls and .xlsx of the same name."""
+    competition = tmp_path / "data" / "2022" / "comp"
+    competition.mkdir(parents=True)
+    (competition / "results.xlsx").write_bytes(owlcms_file.read_bytes())
+    (competition / "results.xls").write_bytes(excelmacro_file.read_bytes())
+    return tmp_path / "data"
+
+
+def test_parse_command(data_dir, owlcms_file, excelmacro_file, tmp_path):
+    """Test every file is written to its own output."""
+    output_dir = tmp_path / "parsed"
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "parse",
+            str(data_dir),
+            "-o",
+            str(output_dir),
+            "-j",
+            "1",
+            "--cache-dir",
+            str(tmp_path / "cache"),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Parsed 2 of 2 files." in result.output
+    for name, file in [
+        ("results.xlsx", owlcms_file),
+        ("results.xls", excelmacro_file),
+    ]:
+        with open(output_dir / "2022" / "comp" / f"{name}.json") as f:
+            assert json.load(f)["lifts"] == CompetitionFile(file).lifts
+
+
+def test_parse_command_failure(data_dir, tmp_path):
+    """Test a file that cannot be parsed is reported and fails the run."""
+    (data_dir / "2022" / "comp" / "broken.xlsx").write_text("not excel")
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "parse",
+            str(data_dir),
+            "-o",
+            str(tmp_path / "out"),
+            "-j",
+            "1",
+            "--cache-dir",
+            str(tmp_path / "cache"),
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "broken.xlsx FAILED" in result.output
+    assert "Parsed 2 of 3 files." in result.output
+
+
+def test_timings_command(owlcms_file, tmp_path):
+    """Test the stage timings of a file are written as JSON."""
+    output = tmp_path / "timings.json"
+
+    result = CliRunner().invoke(
+        app, ["timings", str(owlcms_file), "-o", str(output)]
+    )
+
+    assert result.exit_code == 0, result.output
+    with open(output) as f:
+        stages = json.load(f)["stages"]
+    assert stages["file.results"]["count"] == 1
+    assert "file.parse_sheet" in result.output
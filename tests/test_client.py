@@ -0,0 +1,119 @@
+"""Test."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from client import AsyncLifterAPI, PooledLifterAPI
+from file import CompetitionFile
+
+
+def test_async_requests(stub_api):
+    """Test concurrent calls reach the API and errors are HTTPErrors."""
+
+    async def run():
+        api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+        async with AsyncLifterAPI(api, concurrency=8, rate=None) as client:
+            created = await asyncio.gather(
+                *(
+                    client.create_athlete("Ann", f"Lee{i}", 1990)
+                    for i in range(20)
+                )
+            )
+            found = await client.find_athlete("Ann Lee7")
+            await client.delete_athlete(created[0]["reference_id"])
+            with pytest.raises(requests.HTTPError) as e:
+                await client.delete_athlete(created[0]["reference_id"])
+        return created, found, e.value
+
+    created, found, error = asyncio.run(run())
+
+    assert len(stub_api.athletes) == 19
+    assert len({athlete["reference_id"] for athlete in created}) == 20
+    assert found["results"][0]["last_name"] == "Lee7"
+    assert error.response.status_code == 404
+
+
+def test_async_delete_lift(stub_api, owlcms_file):
+    """Test lifts are deleted, with as many threads as pooled connections."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token", pool_size=4)
+    competition = api.create_competition(
+        date_start="2022-06-04",
+        date_end="2022-06-05",
+        location="Christchurch",
+        name="2022 NZ Open",
+    )["reference_id"]
+    for lift in CompetitionFile(owlcms_file).lifts:
+        athlete = api.create_athlete(**lift.pop("athlete"))["reference_id"]
+        api.create_lift(competition_id=competition, athlete_id=athlete, **lift)
+
+    async def run():
+        async with AsyncLifterAPI(api, rate=None) as client:
+            lifts = await client.lifts(competition)
+            await asyncio.gather(
+                *(
+                    client.delete_lift(competition, lift["reference_id"])
+                    for lift in lifts
+                )
+            )
+            return client.concurrency, await client.lifts(competition)
+
+    workers, lifts = asyncio.run(run())
+
+    assert workers == 4
+    assert lifts == []
+    assert stub_api.lifts == {}
+
+
+class SlowAPI:
+    """Blocking client counting the calls in flight."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.most = 0
+
+    def athletes(self, page):
+        with self.lock:
+            self.in_flight += 1
+            self.most = max(self.most, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        return {"page": page}
+
+
+@pytest.mark.parametrize("concurrency", [1, 4, 16])
+def test_async_concurrency_limit(concurrency):
+    """Test no more than the limit of calls run at once."""
+    api = SlowAPI()
+
+    async def run():
+        async with AsyncLifterAPI(api, concurrency, rate=None) as client:
+            return await asyncio.gather(
+                *(client.athletes(page) for page in range(32))
+            )
+
+    pages = asyncio.run(run())
+
+    assert [page["page"] for page in pages] == list(range(32))
+    assert api.most == concurrency
+
+
+def test_async_rate_limit():
+    """Test calls start no faster than the rate."""
+    starts = []
+
+    def start():
+        starts.append(time.monotonic())
+
+    async def run():
+        async with AsyncLifterAPI(None, concurrency=8, rate=100) as client:
+            await asyncio.gather(*(client.call(start) for _ in range(11)))
+
+    asyncio.run(run())
+
+    assert starts[-1] - starts[0] >= 0.095
@@ -0,0 +1,69 @@
+"""Test."""
+
+from client import PooledLifterAPI
+from competitions import CompetitionCatalogue
+
+
+def competition(i, date_start="2022-06-04"):
+    """Provide a competition."""
+    return {
+        "date_start": date_start,
+        "date_end": date_start,
+        "location": "Christchurch",
+        "name": f"Club Champs {i}",
+    }
+
+
+def test_competition_catalogue_find(stub_api):
+    """Test competitions are found by start date and name."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    for i in range(7):
+        api.create_competition(**competition(i, f"2022-06-0{i % 2 + 1}"))
+    competitions = CompetitionCatalogue(api)
+
+    assert len(competitions.find(date_start="2022-06-01")) == 4
+    assert len(competitions.find(date_start="2022-06-03")) == 0
+    assert len(competitions.find(name="club CHAMPS 3")) == 1
+    assert (
+        competitions.find(date_start="2022-06-01", name="Club Champs 3") == []
+    )
+    assert len(competitions) == 7
+
+
+def test_competition_catalogue_refresh(stub_api):
+    """Test the catalogue is only refreshed once stale, and incrementally."""
+    now = [0]
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    for i in range(4):
+        api.create_competition(**competition(i))
+    competitions = CompetitionCatalogue(api, ttl=60, clock=lambda: now[0])
+    competitions.find()
+    api.create_competition(**competition(4))
+    stub_api.requests.clear()
+
+    assert len(competitions.find(date_start="2022-06-04")) == 4
+    assert stub_api.requests == []
+
+    now[0] = 61
+    assert len(competitions.find(date_start="2022-06-04")) == 5
+    # page 2 holds competitions 4 and 5
+    assert stub_api.requests == ["GET /v1/competitions"]
+
+    created = competitions.create_competition(**competition(5, "2022-07-01"))
+    assert competitions.find(date_start="2022-07-01") == [created]
+
+
+def test_competition_catalogue_refresh_full_pages(stub_api):
+    """Test a refresh after a full last page fetches only that page."""
+    now = [0]
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    for i in range(6):
+        api.create_competition(**competition(i))
+    competitions = CompetitionCatalogue(api, ttl=60, clock=lambda: now[0])
+    competitions.find()
+    stub_api.requests.clear()
+
+    now[0] = 61
+    assert len(competitions.find()) == 6
+    # page 2 holds competitions 4 to 6, and page 3 does not exist
+    assert stub_api.requests == ["GET /v1/competitions"]
@@ -0,0 +1,72 @@
+"""Test."""
+
+import threading
+
+import pytest
+
+from client import PooledLifterAPI
+from dangerous import delete_all, nuke_competitions
+
+
+def create_athletes(api, n):
+    """Create athletes."""
+    for i in range(n):
+        api.create_athlete(
+            first_name=f"First{i}", last_name="Last", yearborn=1990
+        )
+
+
+def test_delete_all(stub_api):
+    """Test every record is deleted, though deleting shifts the pages."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    create_athletes(api, 10)
+
+    report = delete_all(api.athletes, api.delete_athlete, workers=2)
+
+    assert (report.listed, report.deleted, report.skipped) == (10, 10, 0)
+    assert stub_api.athletes == {}
+
+
+def test_delete_all_dry_run(stub_api):
+    """Test a dry run only counts."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    for i in range(5):
+        api.create_competition(
+            date_start="2022-06-04",
+            date_end="2022-06-04",
+            location="Christchurch",
+            name=f"Club Champs {i}",
+        )
+
+    report = nuke_competitions(api, dry_run=True)
+
+    assert (report.listed, report.deleted) == (5, 0)
+    assert len(stub_api.competitions) == 5
+
+
+def test_delete_all_resumes_from_checkpoint(stub_api, tmp_path):
+    """Test an interrupted delete carries on from its checkpoint."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    create_athletes(api, 10)
+    checkpoint = tmp_path / "athletes.checkpoint"
+    deleted = []
+    lock = threading.Lock()
+
+    def delete(reference_id):
+        with lock:
+            if len(deleted) == 4:
+                raise RuntimeError("interrupted")
+            deleted.append(reference_id)
+        return api.delete_athlete(reference_id)
+
+    with pytest.raises(RuntimeError):
+        delete_all(api.athletes, delete, checkpoint=checkpoint, workers=1)
+    assert checkpoint.read_text().split() == deleted
+
+    report = delete_all(
+        api.athletes, api.delete_athlete, checkpoint=checkpoint
+    )
+
+    assert report.deleted == 6
+    assert stub_api.athletes == {}
+    assert not checkpoint.exists()
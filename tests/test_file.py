@@ -0,0 +1,289 @@
+"""Test."""
+
+import pickle
+import re
+import shutil
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from file import ATTEMPT_FIELDS, CompetitionFile, OWLCMS_ATTEMPT_COLUMNS
+from tests.workbooks import make_excelmacro_workbook, make_owlcms_workbook
+from utils.helpers import (
+    determine_lift,
+    parse_lift_number,
+    parse_weight_category,
+)
+from utils.cache import ParseCache
+from utils.types import LiftRecord
+
+
+def test_lifts_parsed_once(owlcms_file, monkeypatch):
+    """Test repeated access neither grows lifts nor re-reads sheets."""
+    reads = []
+    parse = pd.ExcelFile.parse
+
+    def counting_parse(self, sheet_name, *args, **kwargs):
+        reads.append(sheet_name)
+        return parse(self, sheet_name, *args, **kwargs)
+
+    monkeypatch.setattr(pd.ExcelFile, "parse", counting_parse)
+    comp = CompetitionFile(owlcms_file, "owlcms")
+    lengths = {len(comp.lifts) for _ in range(5)}
+    comp.athletes
+
+    assert lengths == {10}
+    assert sorted(reads) == ["Men's Results", "Women's Results"]
+
+
+def test_refresh(owlcms_file):
+    """Test refresh re-reads the file and lifts are not shared."""
+    comp = CompetitionFile(owlcms_file, "owlcms")
+    comp.lifts[0].pop("athlete")
+    comp.refresh()
+    assert "athlete" in comp.lifts[0]
+
+
+def test_rewritten_file_reopened(owlcms_file):
+    """Test lifts and sheetnames follow a file rewritten in place."""
+    comp = CompetitionFile(owlcms_file, "owlcms")
+    lifts = len(comp.lifts)
+    assert "Notes" not in comp.sheetnames
+
+    make_owlcms_workbook(owlcms_file, lifters=4)
+    workbook = load_workbook(owlcms_file)
+    workbook.create_sheet("Notes")
+    workbook.save(owlcms_file)
+
+    assert len(comp.lifts) < lifts
+    assert comp.lifts == CompetitionFile(owlcms_file, "owlcms").lifts
+    assert "Notes" in comp.sheetnames
+
+
+def test_owlcms_results_match_scalar_helpers(owlcms_file):
+    """Test the columnar owlcms parser agrees with the scalar helpers."""
+    comp = CompetitionFile(owlcms_file, "owlcms")
+    df = comp.extract("Men's Results", "Women's Results")
+    rows = [row for _, row in df.iterrows() if type(row["Lot"]) is int]
+
+    for lift, row in zip(comp.lifts, rows, strict=True):
+        assert lift["athlete"]["yearborn"] == int(row["Born"])
+        assert lift["lottery_number"] == row["Lot"]
+        for name, column in OWLCMS_ATTEMPT_COLUMNS.items():
+            assert lift[name] == determine_lift(row[column])
+            assert lift[f"{name}_weight"] == parse_lift_number(row[column])
+        assert lift["weight_category"] == parse_weight_category(row["Cat."])
+
+
+def test_excelmacro_results(excelmacro_file):
+    """Test sessions and weight classes are carried onto athletes."""
+    comp = CompetitionFile(excelmacro_file, "excelmacro")
+    lifts = comp.lifts
+
+    assert len(lifts) == 10
+    assert {lift["session_number"] for lift in lifts} == {1, 2}
+    assert {lift["weight_category"] for lift in lifts} <= {
+        "M69",
+        "M77",
+        "W53",
+        "W69",
+    }
+    assert lifts[0]["athlete"] == comp.athletes[0]
+
+
+@pytest.mark.parametrize(
+    "weight_classes,message",
+    [
+        pytest.param((), "No weightclass set", id="No weight class"),
+        pytest.param(("69kg",), "'69kgm' or '69kgw'", id="Ambiguous"),
+    ],
+)
+def test_excelmacro_errors_batched(tmp_path, weight_classes, message):
+    """Test every offending athlete is reported in one error."""
+    path = tmp_path / "excelmacro.xlsx"
+    make_excelmacro_workbook(path, weight_classes=weight_classes)
+    comp = CompetitionFile(path, "excelmacro")
+
+    with pytest.raises(Exception, match=message) as e:
+        comp.lifts
+    assert len(str(e.value).splitlines()) == 10
+
+
+def test_lift_record_round_trip(owlcms_file):
+    """Test records convert to and from the `api.create_lift` shape."""
+    lift = CompetitionFile(owlcms_file, "owlcms").lifts[0]
+    assert LiftRecord.from_dict(lift).to_dict() == lift
+
+
+def test_detect_file_type(owlcms_file, excelmacro_file, tmp_path):
+    """Test the file type is detected when not given."""
+    other = tmp_path / "other.xlsx"
+    pd.DataFrame({"a": [1, 2]}).to_excel(other, index=False)
+
+    assert CompetitionFile(owlcms_file).file_type == "owlcms"
+    assert CompetitionFile(excelmacro_file).file_type == "excelmacro"
+    assert CompetitionFile(other).file_type == ""
+
+
+def test_detect_file_type_again(owlcms_file, excelmacro_file, tmp_path):
+    """Test a detected file type follows the file, a given one is kept."""
+    path = tmp_path / "results"
+    shutil.copy(owlcms_file, path)
+    detected = CompetitionFile(path)
+    given = CompetitionFile(path, "owlcms")
+    assert detected.file_type == given.file_type == "owlcms"
+
+    shutil.copy(excelmacro_file, path)
+
+    assert detected.file_type == "excelmacro"
+    assert given.file_type == "owlcms"
+
+
+def test_parse_cache_hit_skips_excel(owlcms_file, tmp_path, monkeypatch):
+    """Test a cached file is loaded without opening the workbook."""
+    cache = ParseCache(tmp_path / "cache")
+    comp = CompetitionFile(owlcms_file, cache=cache)
+    lifts, competition = comp.lifts, comp.competition
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Excel file opened")
+
+    monkeypatch.setattr(pd, "ExcelFile", fail)
+    cached = CompetitionFile(owlcms_file, cache=cache)
+
+    assert cached.lifts == lifts
+    assert cached.competition == competition
+    assert cached.file_type == "owlcms"
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path):
+    """Test the cache stays under its size limit."""
+    cache = ParseCache(tmp_path, max_bytes=2500)
+    for key in "abc":
+        cache.put(key, b"x" * 1000)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == b"x" * 1000
+
+
+def test_parse_cache_get_while_evicted(tmp_path, monkeypatch):
+    """Test a value is returned when it is evicted as it is loaded."""
+    cache = ParseCache(tmp_path)
+    cache.put("a", b"x")
+    load = pickle.load
+
+    def evicted(f):
+        value = load(f)
+        (tmp_path / "a.pickle").unlink()
+        return value
+
+    monkeypatch.setattr(pickle, "load", evicted)
+
+    assert cache.get("a") == b"x"
+
+
+@pytest.mark.parametrize("file", ["owlcms_file", "excelmacro_file"])
+def test_iter_lifts_matches_lifts(file, request):
+    """Test streamed lifts are the same as the parsed lifts."""
+    comp = CompetitionFile(request.getfixturevalue(file))
+    assert [lift.to_dict() for lift in comp.iter_lifts()] == comp.lifts
+
+
+@pytest.mark.parametrize("dimension", ["", '<dimension ref="A1:C2"/>'])
+def test_iter_lifts_without_dimension(owlcms_file, tmp_path, dimension):
+    """Test rows are streamed whole when the dimension tag is wrong."""
+    path = tmp_path / "results.xlsx"
+    with (
+        zipfile.ZipFile(owlcms_file) as source,
+        zipfile.ZipFile(path, "w") as target,
+    ):
+        for info in source.infolist():
+            data = source.read(info)
+            if info.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb"<dimension [^>]*/>", dimension.encode(), data)
+            target.writestr(info, data)
+
+    comp = CompetitionFile(path)
+    expected = CompetitionFile(owlcms_file).lifts
+    assert [lift.to_dict() for lift in comp.iter_lifts()] == expected
+
+
+def test_manual_lift_mapping_diagnostics(tmp_path):
+    """Test manually mapped rows are converted with a diagnostics table."""
+    path = tmp_path / "other.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Lot", "First", "Last", "Born", "S1", "S2", "S3", "C1"])
+    ws.append([1, "Ann", "Lee", 1990, 60, -62, 62, 70, 63, 0, 58.2, "CCWC"])
+    ws.append([2, "Bo", "Ng", 1991, 70, 72, 75, 90, 95, -97, "58kg", "CCWC"])
+    wb.save(path)
+    comp = CompetitionFile(path, "other")
+    columns = list(comp.extract(*comp.sheetnames).columns)
+    mapping = dict(
+        zip(
+            [
+                "lottery_number",
+                "first_name",
+                "last_name",
+                "yearborn",
+                *ATTEMPT_FIELDS,
+                "bodyweight",
+                "team",
+            ],
+            columns,
+        )
+    )
+    mapping["athlete"] = {
+        field: mapping.pop(field)
+        for field in ("first_name", "last_name", "yearborn")
+    }
+
+    comp.lifts = mapping
+    diagnostics = comp.lift_diagnostics(failed_only=True)
+
+    assert [lift["athlete"]["first_name"] for lift in comp.lifts] == ["Ann"]
+    assert comp.lifts[0]["snatch_second"] == "NOLIFT"
+    assert comp.lifts[0]["bodyweight"] == 58.2
+    assert set(diagnostics["row"]) == {1}
+    assert diagnostics.loc[diagnostics["error"] != "", "field"].tolist() == [
+        "bodyweight"
+    ]
+    assert len(comp.lift_diagnostics()) == 2 * len(diagnostics)
+
+
+def test_sheet_pushdown(owlcms_file, monkeypatch):
+    """Test columns, dtypes and rows are read as asked, and parsed once."""
+    comp = CompetitionFile(owlcms_file)
+    reads = []
+    parse = pd.ExcelFile.parse
+
+    def counting_parse(self, sheet_name, *args, **kwargs):
+        reads.append(sheet_name)
+        return parse(self, sheet_name, *args, **kwargs)
+
+    monkeypatch.setattr(pd.ExcelFile, "parse", counting_parse)
+    df = comp.sheet("Men's Results", ("Lot", "Born"), {"Born": float})
+    head = comp.sheet("Men's Results", ("Lot", "Born"), {"Born": float}, 2)
+
+    assert list(df.columns) == ["Lot", "Born"]
+    assert df["Born"].dtype == float
+    assert head.equals(df.head(2))
+    assert reads == ["Men's Results"]
+    assert len(comp.sheet("Men's Results", nrows=2)) == 2
+    assert len(reads) == 2
+
+
+def test_parallel_extract(tmp_path):
+    """Test sheets parsed in worker processes match those parsed in turn."""
+    path = tmp_path / "excelmacro.xlsx"
+    make_excelmacro_workbook(path, lifters=20, sessions=5)
+    comp = CompetitionFile(path)
+    parallel = CompetitionFile(path, workers=2)
+
+    df = parallel.extract(*parallel.sheetnames, dtype=object)
+
+    assert df.equals(comp.extract(*comp.sheetnames, dtype=object))
+    assert list(df.index) == list(range(len(df)))
+    assert parallel.lifts == comp.lifts
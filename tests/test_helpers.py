@@ -0,0 +1,75 @@
+"""Test."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.helpers import (
+    convert_date,
+    convert_dates,
+    name_parser,
+    parse_names,
+    parse_weight_categories,
+    parse_weight_categories_excelmacro,
+    parse_weight_category,
+    parse_weight_category_excelmacro,
+)
+
+
+def test_convert_dates():
+    """Test dates convert like `convert_date`."""
+    dates = pd.Series(
+        ["5/06/2022", datetime.datetime(2022, 6, 4), "5/06/2022", "30/6/2022"]
+    )
+
+    assert convert_dates(dates).tolist() == [convert_date(d) for d in dates]
+
+
+def test_convert_dates_raises():
+    """Test an invalid date raises as in `convert_date`."""
+    with pytest.raises(ValueError):
+        convert_dates(["2022-06-05"])
+
+
+def test_parse_weight_categories():
+    """Test weight categories parse like `parse_weight_category`."""
+    categories = pd.Series(
+        ["M 61", "F > 87", "F 55", "M 61"], index=[3, 1, 2, 0]
+    )
+
+    parsed = parse_weight_categories(categories)
+
+    assert parsed.tolist() == ["M61", "W87+", "W55", "M61"]
+    assert parsed.index.tolist() == [3, 1, 2, 0]
+    assert parse_weight_category("M > 109") == "M109+"
+    with pytest.raises(TypeError):
+        parse_weight_categories(pd.Series(["M 61", np.nan]))
+
+
+def test_parse_weight_categories_excelmacro():
+    """Test excel macro weight classes parse like the scalar function."""
+    categories = np.array(["69kgM", "53kg", "105+kg"], dtype=object)
+
+    assert parse_weight_categories_excelmacro(categories).tolist() == [
+        parse_weight_category_excelmacro(c) for c in categories
+    ]
+    with pytest.raises(KeyError):
+        parse_weight_categories_excelmacro(["69kg"])
+
+
+def test_parse_names():
+    """Test names parse like `name_parser`."""
+    names = ["Karu Te Moana", "John Paul Smith", "Ann Lee", "Karu Te Moana"]
+
+    parsed = parse_names(pd.Series(names))
+
+    assert [
+        {"first_name": first, "last_name": last}
+        for first, last in zip(parsed["first_name"], parsed["last_name"])
+    ] == [name_parser(name) for name in names]
+    assert name_parser("Karu Te Moana") == {
+        "first_name": "Karu",
+        "last_name": "Te Moana",
+    }
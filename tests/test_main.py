@@ -2,7 +2,7 @@
 
 import pytest
 
-from src.parse_weight_cateogory.main import parse_weight_cateogory
+from utils.helpers import parse_weight_category
 
 
 @pytest.mark.parametrize(
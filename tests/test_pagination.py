@@ -0,0 +1,98 @@
+"""Test."""
+
+import threading
+
+from utils.pagination import Paginator, sync
+
+
+class Pages:
+    """Numbers 0 to `count`, paginated like the lifter-api."""
+
+    def __init__(self, count, page_size=3):
+        self.count = count
+        self.page_size = page_size
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def __call__(self, page):
+        with self._lock:
+            self.fetched.append(page)
+        start = (page - 1) * self.page_size
+        end = min(start + self.page_size, self.count)
+        return {
+            "count": self.count,
+            "next": None if end == self.count else f"?page={page + 1}",
+            "previous": None,
+            "results": list(range(start, end)),
+        }
+
+
+def test_paginator():
+    """Test results are yielded in order and the count is learned."""
+    pages = Pages(20)
+    results = Paginator(pages, workers=3)
+
+    assert list(results) == list(range(20))
+    assert results.count == 20
+    assert results.page_size == 3
+    assert sorted(pages.fetched) == list(range(1, 8))
+
+
+def test_paginator_resume():
+    """Test iteration can start from a later page."""
+    results = Paginator(Pages(10), start=3, page_size=3)
+
+    assert list(results) == list(range(6, 10))
+
+
+def test_paginator_stops_early():
+    """Test breaking out of the loop stops fetching pages."""
+    pages = Pages(300)
+
+    for result in Paginator(pages, workers=2):
+        if result == 4:
+            break
+
+    # page 1, then at most two pages ahead of page 2
+    assert len(pages.fetched) <= 4
+
+
+def test_paginator_reverse():
+    """Test pages can be fetched last page first."""
+    pages = Pages(10)
+
+    assert list(Paginator(pages, reverse=True).pages())[0]["results"] == [9]
+    assert sorted(Paginator(pages, reverse=True)) == list(range(10))
+
+
+def test_sync():
+    """Test a sync resumes from the last page seen, or reports deletions."""
+    pages = Pages(7)
+    known = set()
+    assert sync(pages, known.add) == (7, 3)
+
+    pages.count, pages.fetched = 10, []
+    assert sync(pages, known.add, known, 7, 3) == (10, 3)
+    assert pages.fetched == [3, 4]
+    assert known == set(range(10))
+
+    pages.count = 9
+    assert sync(pages, known.add, known, 10, 3) is None
+
+
+def test_sync_out_of_order():
+    """Test a sync reports results listed before those seen."""
+    known = set(range(7))
+    # two new results listed first, shifting those seen onto later pages
+    listing = [10, 11, *range(7)]
+
+    def fetch_page(page):
+        end = page * 3
+        return {
+            "count": len(listing),
+            "next": None if end >= len(listing) else f"?page={page + 1}",
+            "previous": None,
+            "results": listing[end - 3 : end],
+        }
+
+    assert sync(fetch_page, known.add, known, 7, 3) is None
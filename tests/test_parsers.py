@@ -0,0 +1,72 @@
+"""Test."""
+
+import pytest
+from openpyxl import Workbook
+
+from file import CompetitionFile
+from parsers import PARSERS, Parser, register_parser
+from utils.types import AthleteRecord
+
+
+def test_register_parser(tmp_path):
+    """Test a registered format is detected and parsed."""
+    path = tmp_path / "meet.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Results"
+    ws.append(["Lot", "Name", "Born", "Total"])
+    ws.append([1, "Ann Lee", 1990, 150])
+    wb.save(path)
+
+    class MeetParser(Parser):
+        name = "meet"
+        sheets = ("Results",)
+        columns = ("Lot", "Name", "Born")
+
+        def detect(self, comp):
+            return comp.sheetnames == ["Results"]
+
+        def competition(self, comp):
+            return {"name": "Meet"}
+
+        def results(self, comp):
+            df = self.extract_lifts(comp)
+            assert list(df.columns) == ["Lot", "Name", "Born"]
+            return [AthleteRecord("Ann", "Lee", 1990)], []
+
+    register_parser(MeetParser)
+    try:
+        comp = CompetitionFile(path)
+        assert comp.file_type == "meet"
+        assert comp.competition == {"name": "Meet"}
+        assert comp.athletes == [
+            {"first_name": "Ann", "last_name": "Lee", "yearborn": 1990}
+        ]
+        assert comp.lifts == []
+    finally:
+        del PARSERS["meet"]
+
+
+def test_owlcms_reads_declared_columns(owlcms_file):
+    """Test only the columns the owlcms parser declares are read."""
+    comp = CompetitionFile(owlcms_file)
+    parser = PARSERS[comp.file_type]
+
+    columns = parser.extract_lifts(comp).columns
+
+    assert set(columns) == set(parser.columns)
+    assert "Total" not in columns
+
+
+def test_register_incomplete_parser():
+    """Test a parser missing a method is refused when registered."""
+
+    class DetectOnlyParser(Parser):
+        name = "detectonly"
+
+        def detect(self, comp):
+            return False
+
+    with pytest.raises(TypeError, match="competition, results"):
+        register_parser(DetectOnlyParser)
+    assert "detectonly" not in PARSERS
@@ -0,0 +1,72 @@
+"""Test."""
+
+import pytest
+
+from file import CompetitionFile
+from tests.workbooks import make_textract_responses
+from textract import (
+    BlockIndex,
+    Cell,
+    Table,
+    TextractCompetitionFile,
+    rebuild_tables,
+    response_paths,
+    _cell,
+)
+
+
+@pytest.mark.parametrize("file", ["owlcms_file", "excelmacro_file"])
+@pytest.mark.parametrize("responses", [1, 3, 12])
+def test_textract_matches_excel(file, responses, request, tmp_path):
+    """Test responses of a printed workbook parse like the workbook."""
+    workbook_path = request.getfixturevalue(file)
+    path = tmp_path / "responses.json"
+    make_textract_responses(workbook_path, path, responses)
+
+    comp = CompetitionFile(workbook_path)
+    textract = TextractCompetitionFile(path)
+
+    assert textract.sheetnames == comp.sheetnames
+    assert textract.file_type == comp.file_type
+    assert textract.competition == comp.competition
+    assert textract.athletes == comp.athletes
+    assert textract.lifts == comp.lifts
+    assert [lift.to_dict() for lift in textract.iter_lifts()] == comp.lifts
+
+
+def test_rebuild_tables_continues_across_pages():
+    """Test a table broken across pages, repeating its header, is joined."""
+    index = BlockIndex()
+    for page, texts in enumerate(
+        [["Lot", "Name", "1", "Ann"], ["Lot", "Name", "2", "Bo"]], start=1
+    ):
+        cells = []
+        for i, text in enumerate(texts):
+            cell = f"{page}-{i}"
+            index.words[f"{cell}-w"] = text
+            index.cells[cell] = Cell(i // 2 + 1, i % 2 + 1, (f"{cell}-w",))
+            cells.append(cell)
+        index.tables[f"t{page}"] = Table(page, 0.1, tuple(cells))
+
+    assert rebuild_tables(index) == {
+        "Table 1": [["Lot", "Name"], ["1", "Ann"], ["2", "Bo"]]
+    }
+
+
+def test_response_paths_in_page_order(tmp_path):
+    """Test numbered responses are read in numeric, not text, order."""
+    for i in range(1, 13):
+        (tmp_path / f"{i}.json").write_text("{}")
+
+    assert [path.stem for path in response_paths(tmp_path)] == [
+        str(i) for i in range(1, 13)
+    ]
+
+
+def test_cell():
+    """Test cell text is converted like Excel cells."""
+    assert _cell("-123") == -123
+    assert _cell("58.0") == 58
+    assert _cell("58.25") == 58.25
+    assert _cell("2022-06-04 00:00:00").day == 4
+    assert _cell("M > 109") == "M > 109"
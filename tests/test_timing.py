@@ -0,0 +1,97 @@
+"""Test."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from client import PooledLifterAPI
+from file import CompetitionFile
+from utils import timing
+from utils.timing import PROFILE_ENV, TIMINGS, Timings
+
+
+@pytest.fixture
+def timings():
+    """Start from no timings."""
+    TIMINGS.reset()
+    yield TIMINGS
+    TIMINGS.reset()
+
+
+def test_summary():
+    """Test durations aggregate per stage, including failed spans."""
+    timings = Timings()
+    for seconds in range(1, 101):
+        timings.record("stage", seconds)
+    with pytest.raises(ValueError):
+        with timings.span("failed"):
+            raise ValueError
+
+    summary = timings.summary()
+
+    assert summary["stage"] == {
+        "count": 100,
+        "total": 5050,
+        "p50": 50.5,
+        "p95": pytest.approx(95.05),
+    }
+    assert summary["failed"]["count"] == 1
+
+
+def test_stages(timings, owlcms_file, stub_api, monkeypatch):
+    """Test parsing and API calls are timed, and profiled when asked."""
+    monkeypatch.setenv(PROFILE_ENV, "1")
+    comp = CompetitionFile(owlcms_file)
+    comp.lifts, comp.lifts, comp.competition
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    athlete = api.create_athlete("Ann", "Lee", 1990)
+    api.delete_athlete(athlete["reference_id"])
+
+    exported = json.loads(timings.to_json())
+    stages = exported["stages"]
+
+    assert stages["file.results"]["count"] == 1
+    assert stages["file.competition"]["count"] == 1
+    assert stages["helpers.determine_lifts"]["count"] == 1
+    assert stages["api.POST athletes"]["count"] == 1
+    assert stages["api.DELETE athletes/{id}"]["count"] == 1
+    assert stages["file.results"]["peak_bytes"] > 0
+    assert "parse_sheet" in exported["profiles"]["file.results"]
+    assert "peak_bytes" not in stages["file.parse_sheet"]
+
+
+def test_samples_capped(monkeypatch):
+    """Test percentiles are kept from a bounded sample of durations."""
+    monkeypatch.setattr(timing, "MAX_SAMPLES", 10)
+    timings = Timings()
+    for _ in range(1000):
+        timings.record("stage", 1.0)
+
+    assert len(timings._samples["stage"]) == 10
+    assert timings.summary()["stage"]["count"] == 1000
+    assert timings.summary()["stage"]["total"] == 1000
+
+
+def test_profiles_one_span_at_a_time(monkeypatch):
+    """Test concurrent spans are timed but only one is profiled at once."""
+    monkeypatch.setenv(PROFILE_ENV, "1")
+    timings = Timings()
+    started = threading.Barrier(4)
+
+    def work():
+        with timings.span("stage"):
+            started.wait()
+            bytearray(2**20)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert timings.summary()["stage"]["count"] == 4
+    assert timings._profiles["stage"].total_calls > 0
+    assert not timings._profiling
@@ -0,0 +1,192 @@
+"""Test."""
+
+import threading
+
+import pytest
+import requests
+
+from athletes import AthleteIndex
+from client import PooledLifterAPI
+from dangerous import delete_all
+from file import CompetitionFile
+from upload import upload_lifts
+from utils.cache import file_digest
+from utils.ledger import UploadLedger
+
+
+def find_athlete_id(api, athlete):
+    """Find an athlete by name."""
+    result = api.find_athlete(
+        f"{athlete['first_name']} {athlete['last_name']}"
+    )
+    if result["count"] == 1:
+        return result["results"][0]["reference_id"]
+
+
+def test_upload_lifts(stub_api, owlcms_file):
+    """Test lifts upload in order, retrying server errors."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    competition_id = api.create_competition(
+        date_start="2022-06-04",
+        date_end="2022-06-05",
+        location="Christchurch",
+        name="2022 NZ Open",
+    )["reference_id"]
+    lifts = CompetitionFile(owlcms_file).lifts
+    stub_api.fail = {r"POST /v1/competitions/\w+/lifts": 2}
+
+    results = list(
+        upload_lifts(
+            api, lifts, competition_id, lambda a: find_athlete_id(api, a)
+        )
+    )
+
+    assert [r.athlete for r in results] == [lift["athlete"] for lift in lifts]
+    assert all(r.athlete_created and r.lift_id for r in results)
+    assert len(stub_api.athletes) == len(stub_api.lifts) == len(lifts)
+    assert stub_api.fail[r"POST /v1/competitions/\w+/lifts"] == 0
+
+
+def test_upload_lifts_skips_existing(stub_api, owlcms_file):
+    """Test lifts already in the competition are skipped."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    lifts = CompetitionFile(owlcms_file).lifts
+    list(upload_lifts(api, lifts, "c1", lambda a: find_athlete_id(api, a)))
+
+    results = list(
+        upload_lifts(api, lifts, "c1", lambda a: find_athlete_id(api, a))
+    )
+
+    assert not any(r.athlete_created or r.lift_id for r in results)
+    assert len(stub_api.lifts) == len(lifts)
+
+
+def test_upload_lifts_raises_client_errors(stub_api, owlcms_file):
+    """Test a rejected lift is raised without retrying."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    lifts = CompetitionFile(owlcms_file).lifts[:1]
+
+    with pytest.raises(requests.HTTPError):
+        list(upload_lifts(api, lifts, "c1", lambda a: "missing"))
+
+    assert stub_api.requests.count("POST /v1/competitions/c1/lifts") == 1
+
+
+def test_upload_lifts_ledger(stub_api, owlcms_file, tmp_path):
+    """Test a rerun skips uploaded lifts without any requests."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    lifts = CompetitionFile(owlcms_file).lifts
+    ledger = UploadLedger(tmp_path / "uploads.sqlite")
+    file_hash = file_digest(owlcms_file)
+    first = list(
+        upload_lifts(
+            api,
+            lifts[:4],
+            "c1",
+            lambda a: find_athlete_id(api, a),
+            ledger=ledger,
+            file_hash=file_hash,
+        )
+    )
+    stub_api.requests.clear()
+
+    results = list(
+        upload_lifts(
+            api,
+            lifts,
+            "c1",
+            lambda a: find_athlete_id(api, a),
+            ledger=ledger,
+            file_hash=file_hash,
+            athlete_exists=lambda athlete_id: athlete_id in stub_api.athletes,
+        )
+    )
+
+    assert [r.recorded for r in results] == [True] * 4 + [False] * 6
+    assert [r.lift_id for r in results[:4]] == [r.lift_id for r in first]
+    assert stub_api.requests.count("POST /v1/competitions/c1/lifts") == 6
+    assert stub_api.requests.count("GET /v1/athletes") == 6
+    assert len(stub_api.lifts) == len(lifts)
+
+
+def test_upload_lifts_checks_conflicts_once(stub_api, owlcms_file):
+    """Test the competition's lifts are fetched once for every conflict."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    lifts = CompetitionFile(owlcms_file).lifts
+    list(upload_lifts(api, lifts, "c1", lambda a: find_athlete_id(api, a)))
+    stub_api.requests.clear()
+
+    list(upload_lifts(api, lifts, "c1", lambda a: find_athlete_id(api, a)))
+
+    assert stub_api.requests.count("GET /v1/competitions/c1/lifts") == 1
+
+
+def test_upload_lifts_lost_responses(stub_api, owlcms_file):
+    """Test creates that took effect are not repeated when retried."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    lifts = CompetitionFile(owlcms_file).lifts
+    stub_api.lose = {
+        r"POST /v1/athletes": 2,
+        r"POST /v1/competitions/\w+/lifts": 2,
+    }
+
+    results = list(
+        upload_lifts(api, lifts, "c1", lambda a: find_athlete_id(api, a))
+    )
+
+    assert all(r.athlete_created and r.lift_id for r in results)
+    assert len(stub_api.athletes) == len(stub_api.lifts) == len(lifts)
+    assert stub_api.requests.count("POST /v1/athletes") == len(lifts)
+
+
+def test_upload_lifts_looks_up_in_turn(stub_api, owlcms_file):
+    """Test athletes are looked up one at a time, before any uploads."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    lifts = CompetitionFile(owlcms_file).lifts
+    lookups = []
+    active = threading.Lock()
+
+    def find(athlete):
+        assert active.acquire(blocking=False), "lookups overlap"
+        try:
+            lookups.append(len(stub_api.lifts))
+            return find_athlete_id(api, athlete)
+        finally:
+            active.release()
+
+    list(upload_lifts(api, lifts, "c1", find))
+
+    assert lookups == [0] * len(lifts)
+
+
+def test_upload_lifts_ledger_after_wipe(stub_api, owlcms_file, tmp_path):
+    """Test athletes deleted since the ledger recorded them are recreated."""
+    api = PooledLifterAPI(url=stub_api.url, auth_token="token")
+    lifts = CompetitionFile(owlcms_file).lifts
+    ledger = UploadLedger(tmp_path / "uploads.sqlite")
+    index = AthleteIndex(api)
+
+    def upload(competition_id):
+        index.refresh()
+        return list(
+            upload_lifts(
+                api,
+                lifts,
+                competition_id,
+                index.find_id,
+                create_athlete=index.create_athlete,
+                ledger=ledger,
+                file_hash=file_digest(owlcms_file),
+                athlete_exists=lambda athlete_id: athlete_id in index.athletes,
+            )
+        )
+
+    first = upload("c1")
+    delete_all(api.athletes, api.delete_athlete)
+    results = upload("c2")
+
+    assert all(r.athlete_created and r.lift_id for r in results)
+    assert {r.athlete_id for r in results}.isdisjoint(
+        r.athlete_id for r in first
+    )
+    assert len(stub_api.athletes) == len(lifts)
@@ -1,7 +1,8 @@
 """Test."""
 
 import pytest
-from .utils import convert_date  e
+
+from utils.helpers import convert_date
 
 
 @pytest.mark.parametrize(
@@ -9,7 +10,10 @@ from .utils import convert_date  e
     [
         pytest.param("4/06/2022", "2022-06-04", id="Correct example"),
         pytest.param(
-            "06/04/2022", "2022-06-04", id="Incorrect example", marks=pytest.mark.xfail
+            "06/04/2022",
+            "2022-06-04",
+            id="Incorrect example",
+            marks=pytest.mark.xfail,
         ),
     ],
 )
@@ -0,0 +1,202 @@
+"""Synthetic competition workbooks."""
+
+import datetime
+import itertools
+import json
+import random
+
+from openpyxl import Workbook, load_workbook
+
+OWLCMS_HEADER = [
+    "Lot",
+    "Last Name",
+    "First Name",
+    "Team",
+    "Born",
+    "B.W.",
+    "Cat.",
+    "Group",
+    "Snatch",
+    None,
+    None,
+    "Best",
+    "Rank",
+    "Clean&Jerk",
+    None,
+    None,
+    "Best",
+    "Rank",
+    "Total",
+    "Rank",
+]
+
+
+def attempts(rng: random.Random) -> list[int | None]:
+    """Provide three attempts: made, missed, zero or empty.
+
+    Weights go up after a made lift, as the lifter-api requires.
+    """
+    result = []
+    weight = rng.randint(40, 180)
+    for _ in range(3):
+        made = rng.random() < 0.6
+        result.append(
+            rng.choice([weight if made else -weight] * 4 + [0, None])
+        )
+        if made:
+            weight += rng.randint(1, 5)
+    return result
+
+
+def make_owlcms_workbook(path, lifters: int = 10, seed: int = 0) -> None:
+    """Write an owlcms style results workbook."""
+    rng = random.Random(seed)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Competition"
+    ws.append(["Competition", "2022 NZ Open", None, None])
+    ws.append(["Location", "Christchurch", None, "A Weigh-in 2022-06-05"])
+    ws.append(["Date", "4/06/2022", None, "B Weigh-in 2022-06-06"])
+    for sheet, (sheetname, categories) in enumerate(
+        [
+            ("Men's Results", ["M 61", "M 73", "M > 109"]),
+            ("Women's Results", ["F 55", "F 64", "F > 87"]),
+        ]
+    ):
+        ws = wb.create_sheet(sheetname)
+        ws.append(OWLCMS_HEADER)
+        ws.append(["Group A"] + [None] * 7 + [1, 2, 3, None, None, 1, 2, 3])
+        for i in range(sheet * lifters // 2, (sheet + 1) * lifters // 2):
+            ws.append(
+                [
+                    i + 1,
+                    f"Last{i}",
+                    f"First{i}",
+                    "CCWC",
+                    rng.randint(1960, 2008),
+                    round(rng.uniform(50, 120), 2),
+                    rng.choice(categories),
+                    "A",
+                    *attempts(rng),
+                    None,
+                    None,
+                    *attempts(rng),
+                ]
+            )
+    wb.save(path)
+
+
+def make_excelmacro_workbook(
+    path,
+    lifters: int = 10,
+    sessions: int = 2,
+    seed: int = 0,
+    weight_classes: tuple[str, ...] = ("69kgm", "77kg", "53kg", "69kgw"),
+) -> None:
+    """Write an excel macro style workbook with one sheet per session.
+
+    Every fifth athlete in a session is preceded by a weight class row. An
+    empty `weight_classes` leaves the sessions without any.
+    """
+    rng = random.Random(seed)
+    wb = Workbook()
+    wb.remove(wb.active)
+    for session in range(1, sessions + 1):
+        ws = wb.create_sheet(f"Session {session}")
+        ws.append(["2022 Club Champs"] + [None] * 10)
+        date = datetime.datetime(2022, 6, 3) + datetime.timedelta(session)
+        ws.append(
+            [None, date, None]
+            + ["Session", session, None, None, None, "Christchurch"]
+        )
+        ws.append(["Lot", "Name", "Born", "Team", "BW", 1, 2, 3, 1, 2, 3])
+        for i in range(lifters // sessions):
+            if i % 5 == 0 and weight_classes:
+                ws.append([None, rng.choice(weight_classes)])
+            ws.append(
+                [
+                    i + 1,
+                    rng.choice(
+                        ["Karu Te Moana", "Ann Lee", "John Paul Smith"]
+                    ),
+                    rng.randint(1960, 2008),
+                    "CCWC",
+                    round(rng.uniform(50, 120), 1),
+                    *attempts(rng),
+                    *attempts(rng),
+                ]
+            )
+    wb.save(path)
+
+
+def make_textract_responses(workbook_path, path, responses: int = 1) -> None:
+    """Write what Textract would return for a PDF print of a workbook.
+
+    Each sheet is a page with its name as a title line above a table of
+    its cells. With several `responses`, the blocks are split across
+    JSON files numbered from 1 in the directory `path`, as paged responses
+    are.
+    """
+    wb = load_workbook(workbook_path)
+    blocks = []
+    ids = itertools.count()
+
+    def words(text: str, page: int) -> list[str]:
+        word_ids = []
+        for word in text.split():
+            word_ids.append(f"w{next(ids)}")
+            blocks.append(
+                {
+                    "BlockType": "WORD",
+                    "Id": word_ids[-1],
+                    "Page": page,
+                    "Text": word,
+                }
+            )
+        return word_ids
+
+    for page, ws in enumerate(wb.worksheets, start=1):
+        blocks.append({"BlockType": "PAGE", "Id": f"p{page}", "Page": page})
+        title = {
+            "BlockType": "LINE",
+            "Id": f"l{page}",
+            "Page": page,
+            "Text": ws.title,
+            "Geometry": {"BoundingBox": {"Top": 0.02, "Height": 0.02}},
+        }
+        title["Relationships"] = [
+            {"Type": "CHILD", "Ids": words(ws.title, page)}
+        ]
+        blocks.append(title)
+        table = {
+            "BlockType": "TABLE",
+            "Id": f"t{page}",
+            "Page": page,
+            "Geometry": {"BoundingBox": {"Top": 0.05, "Height": 0.9}},
+            "Relationships": [{"Type": "CHILD", "Ids": []}],
+        }
+        blocks.append(table)
+        for row in ws.iter_rows():
+            for cell in row:
+                text = "" if cell.value is None else str(cell.value)
+                cell_block = {
+                    "BlockType": "CELL",
+                    "Id": f"c{next(ids)}",
+                    "Page": page,
+                    "RowIndex": cell.row,
+                    "ColumnIndex": cell.column,
+                }
+                table["Relationships"][0]["Ids"].append(cell_block["Id"])
+                blocks.append(cell_block)
+                cell_block["Relationships"] = [
+                    {"Type": "CHILD", "Ids": words(text, page)}
+                ]
+    if responses == 1:
+        with open(path, "w") as f:
+            json.dump({"Blocks": blocks}, f)
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    size = -(-len(blocks) // responses)
+    for i in range(responses):
+        with open(path / f"{i + 1}.json", "w") as f:
+            json.dump({"Blocks": blocks[i * size : (i + 1) * size]}, f)